@@ -415,8 +415,6 @@ def import_sentences_from_sheets():
 
         # Check if token is expired and refresh if needed
         expiry_val = user.google_token_expiry
-        if expiry_val and isinstance(expiry_val, datetime) and expiry_val.tzinfo is None:
-            expiry_val = expiry_val.replace(tzinfo=timezone.utc)
         if expiry_val and datetime.now(timezone.utc) >= expiry_val:
             auth_service = AuthService()
             try:
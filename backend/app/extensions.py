@@ -1,6 +1,24 @@
 """
 This module initializes Flask extensions to prevent circular imports.
 """
+import orjson
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+
+def _json_serializer(value):
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _engine_options():
+    """Engine defaults shared by every config (SQLALCHEMY_ENGINE_OPTIONS still wins).
+
+    JSON columns (word lists' ``words_json`` above all) go through orjson:
+    several times faster than the stdlib for large string arrays.
+    """
+    return {
+        'json_serializer': _json_serializer,
+        'json_deserializer': orjson.loads,
+    }
+
+
+db = SQLAlchemy(engine_options=_engine_options())
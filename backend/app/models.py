@@ -1,9 +1,32 @@
-from datetime import datetime
-from sqlalchemy import Index
+from datetime import datetime, timezone
+from sqlalchemy import Index, text
+from sqlalchemy.orm import validates
+from sqlalchemy.types import TypeDecorator
 from .extensions import db
 import secrets
 
 
+class UTCDateTime(TypeDecorator):
+    """DateTime stored as naive UTC and always loaded as timezone-aware UTC.
+
+    Aware values are converted to UTC before storage and naive values are taken
+    to be UTC already. The underlying column is a plain DateTime, so the schema
+    is unchanged.
+    """
+    impl = db.DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class User(db.Model):
     """Model for user accounts"""
     __tablename__ = 'users'
@@ -15,7 +38,7 @@ class User(db.Model):
     google_id = db.Column(db.String(255), unique=True, index=True)
     google_access_token = db.Column(db.Text)  # OAuth access token for Sheets/Drive
     google_refresh_token = db.Column(db.Text)  # OAuth refresh token
-    google_token_expiry = db.Column(db.DateTime)  # Token expiration time
+    google_token_expiry = db.Column(UTCDateTime)  # Token expiration time (always aware UTC)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_login = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
@@ -27,7 +50,14 @@ class User(db.Model):
     jobs = db.relationship('Job', backref='user', lazy='dynamic', cascade='all, delete-orphan', foreign_keys='Job.user_id')
     cancelled_jobs = db.relationship('Job', backref='canceller', lazy='dynamic', foreign_keys='Job.cancelled_by')
     sessions = db.relationship('UserSession', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    
+
+    @validates('google_token_expiry')
+    def _validate_google_token_expiry(self, key, value):
+        """Keep in-memory expiry values aware UTC, matching what UTCDateTime loads"""
+        if isinstance(value, datetime) and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
     def __repr__(self):
         return f'<User {self.email}>'
     
@@ -438,6 +468,11 @@ class WordList(db.Model):
     
     __table_args__ = (
         Index('idx_wordlist_owner_name', 'owner_user_id', 'name'),
+        # At most one global default, enforced by the database; the partial index
+        # holds only the flagged row, so default lookups are a single index seek
+        Index('ux_wordlist_global_default', 'is_global_default', unique=True,
+              postgresql_where=text('is_global_default'),
+              sqlite_where=text('is_global_default = 1')),
     )
     
     def __repr__(self):
@@ -324,8 +324,9 @@ def estimate_pdf():
     pdf_service = PDFService(file)
     
     try:
-        # Get metadata without full text extraction (fast operation)
-        metadata = pdf_service.get_page_count()
+        # Get metadata without full text extraction (fast operation), reading
+        # the spooled upload stream itself rather than the FileStorage wrapper
+        metadata = pdf_service.get_page_count(file.stream)
         page_count = metadata['page_count']
         file_size = metadata['file_size']
         image_count = metadata.get('image_count', 0)
@@ -154,7 +154,7 @@ class AuthService:
             if oauth_tokens:
                 user.google_access_token = oauth_tokens.get('access_token')
                 user.google_refresh_token = oauth_tokens.get('refresh_token')
-                # Normalize expiry to timezone-aware UTC if possible
+                # User.google_token_expiry normalizes naive datetimes to UTC
                 expiry_val = oauth_tokens.get('expiry')
                 if expiry_val:
                     try:
@@ -165,9 +165,6 @@ class AuthService:
                     except Exception:
                         pass
 
-                    if isinstance(expiry_val, datetime) and expiry_val.tzinfo is None:
-                        expiry_val = expiry_val.replace(tzinfo=timezone.utc)
-
                     user.google_token_expiry = expiry_val
         else:
             # Create new user
@@ -191,9 +188,6 @@ class AuthService:
                     except Exception:
                         pass
 
-                    if isinstance(expiry_val, datetime) and expiry_val.tzinfo is None:
-                        expiry_val = expiry_val.replace(tzinfo=timezone.utc)
-
                     user.google_token_expiry = expiry_val
             
             db.session.add(user)
@@ -237,11 +231,8 @@ class AuthService:
             # Update user's tokens
             user.google_access_token = credentials.token
             if credentials.expiry:
-                expiry_val = credentials.expiry
-                # credentials.expiry from google oauth is usually timezone-aware
-                if isinstance(expiry_val, datetime) and expiry_val.tzinfo is None:
-                    expiry_val = expiry_val.replace(tzinfo=timezone.utc)
-                user.google_token_expiry = expiry_val
+                # google-auth reports a naive UTC expiry; the column treats it as UTC
+                user.google_token_expiry = credentials.expiry
             
             db.session.commit()
             
@@ -266,11 +257,8 @@ class AuthService:
         if not user.google_access_token:
             raise ValueError('User has not authorized Google access')
         
-        # Check if token is expired (ensure stored expiry is timezone-aware)
+        # Check if token is expired (google_token_expiry is always aware UTC)
         expiry_val = user.google_token_expiry
-        if expiry_val and isinstance(expiry_val, datetime) and expiry_val.tzinfo is None:
-            expiry_val = expiry_val.replace(tzinfo=timezone.utc)
-
         if expiry_val and expiry_val < datetime.now(timezone.utc):
             current_app.logger.info(f'Token expired for user {user.id}, refreshing...')
             self.refresh_user_token(user)
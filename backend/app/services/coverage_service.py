@@ -1,31 +1,49 @@
 """Service for vocabulary coverage analysis (Coverage and Filter modes)"""
 import logging
 import os
+import re
 import datetime
-from typing import Dict, List, Set, Tuple, Optional, Callable, Any
+from typing import Dict, Iterable, List, Set, Tuple, Optional, Callable, Any
 from collections import defaultdict
 import heapq
 from app.utils.linguistics import LinguisticsUtils
 
 logger = logging.getLogger(__name__)
 
+# A whitespace-delimited chunk containing at least one letter. spaCy never merges
+# tokens across whitespace and such a chunk always yields a non-punctuation
+# token, so the match count is a lower bound on a sentence's token count.
+# Deliberately not re.ASCII: accented letters (à, é, ...) must count as letters.
+_WORDLIKE_CHUNK_RE = re.compile(r'\S*[^\W\d_]\S*')
+
 
 class CoverageService:
     """Handles vocabulary coverage analysis in Coverage and Filter modes"""
 
     def __init__(
         self,
-        wordlist_keys: Set[str],
+        wordlist_keys: Iterable[str],
         config: Optional[Dict] = None,
+        keys_normalized: bool = False,
     ):
         """
         Initialize coverage service.
 
         Args:
-            wordlist_keys: Set of normalized word keys from word list
+            wordlist_keys: Normalized word keys from word list (any iterable;
+                stored as a frozenset)
             config: Configuration dict with mode-specific settings
+            keys_normalized: The keys already went through normalize_french_lemma
+                (e.g. taken from another service's wordlist_keys); skip that pass
         """
-        self.wordlist_keys = {LinguisticsUtils.normalize_french_lemma(key) for key in wordlist_keys}
+        # Immutable once built: every sentence is matched against it, and mutable
+        # working copies (e.g. uncovered words) are taken with set(...). A frozenset
+        # (rather than a trie) because the modes also need set algebra on the keys
+        # (intersection, difference, bit ordering), not just membership tests.
+        self.wordlist_keys = frozenset(
+            wordlist_keys if keys_normalized else
+            (LinguisticsUtils.normalize_french_lemma(key) for key in wordlist_keys)
+        )
         self.config = config or {}
 
         # Filter mode defaults
@@ -33,6 +51,9 @@ class CoverageService:
         self.len_max = self.config.get('len_max', 8)
         self.target_count = self.config.get('target_count', 500)
 
+        # Coverage mode: sentences picked per greedy iteration ("big step" greedy)
+        self.greedy_big_step = max(1, int(self.config.get('greedy_big_step', 1)))
+
         # Scaled min_in_list_ratio for filter mode
         self.scaled_min_ratios = self.config.get('scaled_min_ratios', {
             3: 0.99, 4: 0.99, 5: 0.9, 6: 0.8, 7: 0.7, 8: 0.65
@@ -42,10 +63,42 @@ class CoverageService:
         # Normalization settings
         self.fold_diacritics = self.config.get('fold_diacritics', True)
         self.handle_elisions = self.config.get('handle_elisions', True)
+
+        # Bit position of each word key: sentences are scored in the greedy loop as
+        # int bitmasks, so "new words" is an AND and counting them is a popcount
+        self._words_by_bit = sorted(self.wordlist_keys)
+        self._word_bits = {word: bit for bit, word in enumerate(self._words_by_bit)}
+
+    def _words_to_mask(self, words) -> int:
+        """Encode word keys from the word list as a bitmask (unknown words are ignored)."""
+        mask = 0
+        for word in words:
+            bit = self._word_bits.get(word)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _mask_to_words(self, mask: int) -> Set[str]:
+        """Decode a bitmask back into the word keys it represents."""
+        words = set()
+        while mask:
+            low_bit = mask & -mask
+            words.add(self._words_by_bit[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return words
     
     def build_sentence_index(self, sentences: List[str]) -> Dict[int, Dict]:
         index = {}
 
+        # Sentences that certainly exceed len_max are dropped before any NLP work:
+        # the cheap word-chunk count never overestimates the spaCy token count, so
+        # nothing that would have been indexed is lost. The lower bound (len_min)
+        # is still checked after tokenization, where the exact count is known.
+        candidates = [
+            (idx, sentence) for idx, sentence in enumerate(sentences)
+            if len(_WORDLIKE_CHUNK_RE.findall(sentence)) <= self.len_max
+        ]
+
         try:
             from app.utils.linguistics import get_nlp
             nlp = get_nlp()
@@ -53,69 +106,91 @@ class CoverageService:
             nlp = None
 
         if nlp is not None and hasattr(nlp, 'pipe'):
-            # Process in batches to prevent memory spikes. Batch size can be tuned
-            # at runtime via the COVERAGE_SPACY_BATCH_SIZE environment variable.
-            try:
-                batch_size = int(os.getenv('COVERAGE_SPACY_BATCH_SIZE', '100'))
-            except Exception:
-                batch_size = 100
-            for batch_start in range(0, len(sentences), batch_size):
-                batch_end = min(batch_start + batch_size, len(sentences))
-                batch_sentences = sentences[batch_start:batch_end]
-                
-                docs = nlp.pipe(batch_sentences)
-                for offset, (sentence, doc) in enumerate(zip(batch_sentences, docs)):
-                    idx = batch_start + offset
-                    tokens = []
-                    for token in doc:
-                        if getattr(token, 'is_punct', False) or getattr(token, 'is_space', False):
-                            continue
-
-                        surface = token.text
-                        lemma = getattr(token, 'lemma_', surface).lower()
-                        pos = getattr(token, 'pos_', None)
-
-                        if self.handle_elisions:
-                            surface_for_norm = LinguisticsUtils.handle_elision(surface)
-                        else:
-                            surface_for_norm = surface
-
-                        normalized_source = lemma if lemma else surface_for_norm
-                        normalized = LinguisticsUtils.normalize_french_lemma(LinguisticsUtils.normalize_text(normalized_source, fold_diacritics=self.fold_diacritics))
-
-                        if not normalized:
-                            continue
-
-                        tokens.append({
-                            'surface': surface,
-                            'lemma': lemma,
-                            'normalized': normalized,
-                            'pos': pos
-                        })
-
-                    token_count = len(tokens)
-                    # Skip indexing sentences outside the configured token-length window
-                    # This avoids carrying large numbers of irrelevant candidates into the
-                    # greedy selection loop and can dramatically reduce runtime for large
-                    # corpora. The defaults are defined on the service instance.
-                    if token_count < self.len_min or token_count > self.len_max:
+            # Stream every sentence through a single nlp.pipe() call so spaCy can
+            # batch tokenizer/tagger work internally; the generator keeps memory
+            # bounded to one batch. Batch size comes from the service config
+            # ('spacy_batch_size') or the COVERAGE_SPACY_BATCH_SIZE env var.
+            batch_size = self.config.get('spacy_batch_size')
+            if batch_size is None:
+                try:
+                    batch_size = int(os.getenv('COVERAGE_SPACY_BATCH_SIZE', '100'))
+                except Exception:
+                    batch_size = 100
+
+            # Optional multi-process tagging for large corpora ('spacy_n_process'
+            # config or COVERAGE_SPACY_N_PROCESS env var; -1 = all cores).
+            # Defaults to 1 because Celery prefork workers are daemonic and cannot
+            # spawn children, standalone scripts need an `if __name__ == '__main__'`
+            # guard on spawn platforms (Windows/macOS), and GPU-loaded models must
+            # stay single-process. Small inputs gain nothing from worker start-up.
+            n_process = self.config.get('spacy_n_process')
+            if n_process is None:
+                try:
+                    n_process = int(os.getenv('COVERAGE_SPACY_N_PROCESS', '1'))
+                except Exception:
+                    n_process = 1
+            if n_process != 1 and len(candidates) < batch_size * 2:
+                n_process = 1
+
+            docs = nlp.pipe(
+                (sentence for _, sentence in candidates),
+                batch_size=batch_size,
+                n_process=n_process,
+            )
+            for (idx, sentence), doc in zip(candidates, docs):
+                tokens = []
+                for token in doc:
+                    if getattr(token, 'is_punct', False) or getattr(token, 'is_space', False):
+                        continue
+
+                    surface = token.text
+                    lemma = getattr(token, 'lemma_', surface).lower()
+                    pos = getattr(token, 'pos_', None)
+
+                    if self.handle_elisions:
+                        surface_for_norm = LinguisticsUtils.handle_elision(surface)
+                    else:
+                        surface_for_norm = surface
+
+                    normalized_source = lemma if lemma else surface_for_norm
+                    normalized = LinguisticsUtils.normalize_french_lemma(LinguisticsUtils.normalize_text(normalized_source, fold_diacritics=self.fold_diacritics))
+
+                    if not normalized:
                         continue
 
-                    matched, unmatched = LinguisticsUtils.match_tokens_to_wordlist(tokens, self.wordlist_keys)
-                    ratio = len(matched) / token_count if token_count else 0.0
-
-                    index[idx] = {
-                        'text': sentence,
-                        'tokens': tokens,
-                        'token_count': token_count,
-                        'words_in_list': set(matched),
-                        'words_not_in_list': set(unmatched),
-                        'in_list_ratio': ratio,
-                        'sentence_obj': sentence
-                    }
+                    tokens.append({
+                        'surface': surface,
+                        'lemma': lemma,
+                        'normalized': normalized,
+                        'pos': pos
+                    })
+
+                token_count = len(tokens)
+                # Skip indexing sentences outside the configured token-length window
+                # This avoids carrying large numbers of irrelevant candidates into the
+                # greedy selection loop and can dramatically reduce runtime for large
+                # corpora. The defaults are defined on the service instance.
+                if token_count < self.len_min or token_count > self.len_max:
+                    continue
+
+                lemmas = [token['normalized'] for token in tokens]
+                ratio, _, _ = LinguisticsUtils.calculate_in_list_ratio_from_lemmas(
+                    lemmas, self.wordlist_keys
+                )
+                words_in_list = self.wordlist_keys.intersection(lemmas)
+
+                index[idx] = {
+                    'text': sentence,
+                    'tokens': tokens,
+                    'token_count': token_count,
+                    'words_in_list': set(words_in_list),
+                    'words_not_in_list': set(lemmas) - words_in_list,
+                    'in_list_ratio': ratio,
+                    'sentence_obj': sentence
+                }
         else:
             # Fallback: per-sentence tokenization
-            for idx, sentence in enumerate(sentences):
+            for idx, sentence in candidates:
                 tokens = LinguisticsUtils.tokenize_and_lemmatize(
                     sentence,
                     fold_diacritics=self.fold_diacritics,
@@ -127,15 +202,18 @@ class CoverageService:
                 if token_count < self.len_min or token_count > self.len_max:
                     continue
 
-                matched, unmatched = LinguisticsUtils.match_tokens_to_wordlist(tokens, self.wordlist_keys)
-                ratio = len(matched) / token_count if token_count else 0.0
+                lemmas = [token['normalized'] for token in tokens]
+                ratio, _, _ = LinguisticsUtils.calculate_in_list_ratio_from_lemmas(
+                    lemmas, self.wordlist_keys
+                )
+                words_in_list = self.wordlist_keys.intersection(lemmas)
 
                 index[idx] = {
                     'text': sentence,
                     'tokens': tokens,
                     'token_count': token_count,
-                    'words_in_list': set(matched),
-                    'words_not_in_list': set(unmatched),
+                    'words_in_list': set(words_in_list),
+                    'words_not_in_list': set(lemmas) - words_in_list,
                     'in_list_ratio': ratio,
                     'sentence_obj': sentence
                 }
@@ -263,6 +341,12 @@ class CoverageService:
         - Pre-filtered candidate pool with dynamic rebuilding
         - Stagnation detection (stops after 50 iterations without progress)
         - Enhanced logging every 50 sentences
+        - Optional "big step" greedy (config 'greedy_big_step' = p > 1): the top-p
+          candidates of an iteration are selected together, cutting iterations
+          by ~p on large corpora. They are scored against the same uncovered set,
+          so overlapping picks are less efficient and the classic greedy
+          approximation bound no longer holds; keep the default of 1 when the
+          smallest learning set matters more than runtime.
 
         Args:
             sentences: List of sentence strings
@@ -291,7 +375,9 @@ class CoverageService:
 
         # TASK 2: Build word frequency index for performance
         # Maps each word_key -> list of sentence indices containing that word
+        # Content words of each sentence are also kept as a bitmask over the word list
         word_frequency_index = defaultdict(list)
+        sentence_masks = {}
         for idx, info in sentence_index.items():
             sentence_words = self.filter_content_words_only(
                 info,
@@ -299,13 +385,52 @@ class CoverageService:
                 fold_diacritics=self.fold_diacritics,
                 handle_elisions=self.handle_elisions
             )
+            sentence_masks[idx] = self._words_to_mask(sentence_words)
             for word_key in sentence_words:
                 word_frequency_index[word_key].append(idx)
 
         logger.info(f"Built word frequency index for {len(word_frequency_index)} words")
 
-        # Track uncovered words
-        uncovered_words = self.wordlist_keys.copy()
+        # Rarity bonuses only depend on the word, so precompute one mask per bonus
+        # level; scoring a candidate is then a popcount per level.
+        # 1. Within-source rarity (how often word appears in THIS source)
+        # 2. Cross-source rarity (how many sources contain this word, batch mode only)
+        word_source_counts = self.config.get('word_source_counts', {})
+        within_very_rare = within_rare = 0
+        cross_exclusive = cross_very_rare = cross_rare = 0
+        rare_mask = 0  # Words in < 20 sentences, for the efficiency bonus
+        for word, bit in self._word_bits.items():
+            word_bit = 1 << bit
+            freq_in_source = len(word_frequency_index.get(word, []))
+            if freq_in_source < 5:
+                within_very_rare |= word_bit
+            elif freq_in_source < 20:
+                within_rare |= word_bit
+            if freq_in_source < 20:
+                rare_mask |= word_bit
+
+            if word_source_counts and word in word_source_counts:
+                source_count = word_source_counts[word]
+                if source_count == 1:
+                    cross_exclusive |= word_bit
+                elif source_count == 2:
+                    cross_very_rare |= word_bit
+                elif source_count <= 3:
+                    cross_rare |= word_bit
+
+        rarity_bonus_masks = [
+            (bonus, mask) for bonus, mask in (
+                (20, within_very_rare),  # Very rare in source
+                (5, within_rare),        # Somewhat rare in source
+                (30, cross_exclusive),   # Exclusive to this source!
+                (15, cross_very_rare),   # Very rare across sources
+                (5, cross_rare),         # Somewhat rare across sources
+            ) if mask
+        ]
+
+        # Track uncovered words (set for reporting, mask for scoring)
+        uncovered_words = set(self.wordlist_keys)
+        uncovered_mask = self._words_to_mask(uncovered_words)
 
         # Track assignments and selections
         assignments = []
@@ -349,6 +474,7 @@ class CoverageService:
         iterations_without_progress = 0
         max_stagnant_iterations = 50
         iteration_count = 0
+        productive_iterations = 0  # iterations that selected at least one sentence
         last_pool_rebuild = 0
 
         # Greedy selection loop
@@ -356,7 +482,7 @@ class CoverageService:
             iteration_count += 1
             best_idx = None
             best_score = float('-inf')
-            best_new_words = set()
+            scored_candidates = []
 
             # Calculate current coverage percentage for adaptive scoring
             total_words = len(self.wordlist_keys) if self.wordlist_keys else 1
@@ -375,61 +501,36 @@ class CoverageService:
                 mode_label = "Very Aggressive"
 
             # Find the sentence with the highest score from candidate pool
+            best_mask = 0
             for idx in candidate_pool:
-                info = sentence_index[idx]
-
-                # Get content words in this sentence
-                sentence_words = self.filter_content_words_only(
-                    info,
-                    self.wordlist_keys,
-                    fold_diacritics=self.fold_diacritics,
-                    handle_elisions=self.handle_elisions
-                )
+                # Find NEW content words (not yet covered)
+                new_mask = sentence_masks[idx] & uncovered_mask
 
-                # Find NEW words (not yet covered)
-                new_words = sentence_words & uncovered_words
-
-                if not new_words:
+                if not new_mask:
                     continue
 
+                new_word_count = new_mask.bit_count()
+
                 # OPTIMIZATION 4: Enhanced scoring with multi-level rarity bonuses
-                score = (len(new_words) * new_word_weight) - info['token_count']
-
-                # Get word-source counts if available (from batch mode)
-                word_source_counts = self.config.get('word_source_counts', {})
-
-                # Rarity bonuses at two levels:
-                # 1. Within-source rarity (how often word appears in THIS source)
-                # 2. Cross-source rarity (how many sources contain this word)
-                for word in new_words:
-                    # Within-source rarity
-                    freq_in_source = len(word_frequency_index.get(word, []))
-                    if freq_in_source < 5:
-                        score += 20  # Very rare in source
-                    elif freq_in_source < 20:
-                        score += 5   # Somewhat rare in source
-
-                    # Cross-source rarity (only in batch mode)
-                    if word_source_counts and word in word_source_counts:
-                        source_count = word_source_counts[word]
-                        if source_count == 1:
-                            score += 30  # Exclusive to this source!
-                        elif source_count == 2:
-                            score += 15  # Very rare across sources
-                        elif source_count <= 3:
-                            score += 5   # Somewhat rare across sources
+                score = (new_word_count * new_word_weight) - sentence_index[idx]['token_count']
+                for bonus, mask in rarity_bonus_masks:
+                    score += bonus * (new_mask & mask).bit_count()
 
                 # Efficiency bonus: reward sentences covering many rare words (past 60%)
-                if coverage_pct > 60 and len(new_words) >= 3:
-                    # Check if at least 3 are rare
-                    rare_count = sum(1 for w in new_words if len(word_frequency_index.get(w, [])) < 20)
-                    if rare_count >= 3:
-                        score += 10
+                if (
+                    coverage_pct > 60
+                    and new_word_count >= 3
+                    and (new_mask & rare_mask).bit_count() >= 3
+                ):
+                    score += 10
+
+                if self.greedy_big_step > 1:
+                    scored_candidates.append((score, idx, new_mask))
 
                 if score > best_score:
                     best_score = score
                     best_idx = idx
-                    best_new_words = new_words
+                    best_mask = new_mask
 
             # If no sentence can cover new words, check stagnation
             if best_idx is None:
@@ -478,35 +579,54 @@ class CoverageService:
 
             # Reset stagnation counter (we found a sentence)
             iterations_without_progress = 0
+            productive_iterations += 1
 
-            # Select this sentence
-            selected_sentence_set.add(best_idx)
-            selected_sentence_order.append(best_idx)
-            sentence_contribution[best_idx] = len(best_new_words)
-            sentence_selection_score[best_idx] = best_score
-            sentence_covered_words[best_idx] = list(best_new_words)
-
-            # Remove from candidate pool
-            candidate_pool.discard(best_idx)
-
-            # Mark words as covered
-            for word_key in best_new_words:
-                word_to_sentence[word_key] = best_idx
-                uncovered_words.discard(word_key)
-
-            # TASK 5: Enhanced logging every 50 sentences
-            if len(selected_sentence_order) % 50 == 0:
-                logger.info(
-                    f"[Iteration {iteration_count}] {mode_label} mode: "
-                    f"Coverage {coverage_pct:.1f}% ({covered_count + len(best_new_words)}/{total_words} words), "
-                    f"Selected {len(selected_sentence_order)} sentences, "
-                    f"Candidate pool size: {len(candidate_pool)}"
-                )
+            if self.greedy_big_step > 1:
+                # nlargest is stable, so the first pick is always best_idx
+                picks = heapq.nlargest(self.greedy_big_step, scored_candidates, key=lambda c: c[0])
+            else:
+                picks = [(best_score, best_idx, best_mask)]
+
+            for pick_score, pick_idx, pick_mask in picks:
+                if max_sentences is not None and len(selected_sentence_order) >= max_sentences:
+                    break
+
+                # Later picks of a big step may overlap words claimed by earlier ones
+                pick_mask &= uncovered_mask
+                if not pick_mask:
+                    continue
+                pick_new_words = self._mask_to_words(pick_mask)
+
+                # Select this sentence
+                selected_sentence_set.add(pick_idx)
+                selected_sentence_order.append(pick_idx)
+                sentence_contribution[pick_idx] = len(pick_new_words)
+                sentence_selection_score[pick_idx] = pick_score
+                sentence_covered_words[pick_idx] = list(pick_new_words)
+
+                # Remove from candidate pool
+                candidate_pool.discard(pick_idx)
+
+                # Mark words as covered
+                for word_key in pick_new_words:
+                    word_to_sentence[word_key] = pick_idx
+                    uncovered_words.discard(word_key)
+                uncovered_mask &= ~pick_mask
+
+                # TASK 5: Enhanced logging every 50 sentences
+                if len(selected_sentence_order) % 50 == 0:
+                    logger.info(
+                        f"[Iteration {iteration_count}] {mode_label} mode: "
+                        f"Coverage {coverage_pct:.1f}% "
+                        f"({len(word_to_sentence)}/{total_words} words), "
+                        f"Selected {len(selected_sentence_order)} sentences, "
+                        f"Candidate pool size: {len(candidate_pool)}"
+                    )
 
             # Progress callback with context
             if progress_callback:
                 try:
-                    new_coverage_pct = ((covered_count + len(best_new_words)) / total_words) * 100
+                    new_coverage_pct = (len(word_to_sentence) / total_words) * 100
                     pct = 15 + int(75 * (new_coverage_pct / 100))
                     pct = min(max(pct, 15), 90)
                     msg = f"{mode_label} mode: {new_coverage_pct:.1f}% coverage..."
@@ -560,6 +680,7 @@ class CoverageService:
             'selected_sentence_count': len(selected_sentence_set),
             'learning_set_count': len(selected_sentence_order),
             'total_iterations': iteration_count,
+            'productive_iterations': productive_iterations,
             'stopped_reason': 'stagnation' if iterations_without_progress >= max_stagnant_iterations else 'complete',
             'learning_set': [
                 {
@@ -693,7 +814,7 @@ class CoverageService:
         # Track global state across all sources
         all_assignments = []
         all_selected_sentences = []
-        uncovered_words = self.wordlist_keys.copy()
+        uncovered_words = set(self.wordlist_keys)
         total_words_initial = len(self.wordlist_keys)
 
         # Global sentence limit from config (0 = unlimited)
@@ -819,7 +940,8 @@ class CoverageService:
             temp_config['word_source_counts'] = word_source_counts  # For rarity weighting
             temp_service = CoverageService(
                 wordlist_keys=uncovered_words,
-                config=temp_config
+                config=temp_config,
+                keys_normalized=True
             )
 
             # Run coverage mode on this source
@@ -940,7 +1062,7 @@ class CoverageService:
                         'len_min': self.len_min,
                         'len_max': self.len_max,
                         'target_count': remaining_slots
-                    })
+                    }, keys_normalized=True)
 
                     # Run greedy on the pool to try to pick extra sentences
                     extra_assignments, extra_stats = temp_service.coverage_mode_greedy(pool_sentences)
@@ -1064,18 +1186,23 @@ class CoverageService:
         # Emit periodic progress during scanning
         step = max(1, total // 50)  # ~2% granularity
 
+        def report_scan_progress(i: int):
+            if progress_callback and (i % step == 0 or i == total):
+                try:
+                    pct = 10 + int(80 * (i / total))
+                    pct = min(max(pct, 10), 90)
+                    progress_callback(pct)
+                except Exception:
+                    pass
+
         for i, (idx, info) in enumerate(sentence_index.items(), start=1):
             token_count = info['token_count']
 
-            # First check basic criteria
-            if token_count > max_tokens:
-                if progress_callback and (i % step == 0 or i == total):
-                    try:
-                        pct = 10 + int(80 * (i / total))
-                        pct = min(max(pct, 10), 90)
-                        progress_callback(pct)
-                    except Exception:
-                        pass
+            # First check basic criteria. Matched content words are a subset of
+            # words_in_list, so a sentence with fewer in-list words than required
+            # can be rejected without scanning its tokens.
+            if token_count > max_tokens or len(info['words_in_list']) < min_content_words:
+                report_scan_progress(i)
                 continue
 
             # Filter to only content words from the matched set using pre-tokenized tokens
@@ -1101,13 +1228,7 @@ class CoverageService:
                     'content_word_count': content_word_count
                 })
 
-            if progress_callback and (i % step == 0 or i == total):
-                try:
-                    pct = 10 + int(80 * (i / total))
-                    pct = min(max(pct, 10), 90)
-                    progress_callback(pct)
-                except Exception:
-                    pass
+            report_scan_progress(i)
 
         # No sorting/scoring: preserve original sentence order for selected results
 
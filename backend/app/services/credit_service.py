@@ -1,7 +1,7 @@
 """Service for managing user credits and ledger operations"""
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from app import db
 from app.models import CreditLedger, User
@@ -360,32 +360,40 @@ class CreditService:
         # Ensure monthly grant exists
         CreditService.ensure_monthly_grant(user_id)
         
-        # Get all entries for the month
-        entries = CreditLedger.query.filter_by(
-            user_id=user_id,
-            month=month
-        ).all()
+        # Aggregate the month in a single grouped query: per reason, the sum of
+        # credits added (positive deltas) and removed (negative deltas)
+        totals = db.session.query(
+            CreditLedger.reason,
+            func.coalesce(func.sum(case(
+                (CreditLedger.delta_credits > 0, CreditLedger.delta_credits), else_=0
+            )), 0),
+            func.coalesce(func.sum(case(
+                (CreditLedger.delta_credits < 0, CreditLedger.delta_credits), else_=0
+            )), 0),
+        ).filter(
+            CreditLedger.user_id == user_id,
+            CreditLedger.month == month
+        ).group_by(CreditLedger.reason).all()
         
         granted = 0
         used = 0
         refunded = 0
         adjusted = 0
         
-        for entry in entries:
-            if entry.reason == CREDIT_REASON_MONTHLY_GRANT:
-                granted += entry.delta_credits
-            elif entry.reason in [CREDIT_REASON_JOB_RESERVE, CREDIT_REASON_COVERAGE_RUN]:
-                used += abs(entry.delta_credits)
-            elif entry.reason == CREDIT_REASON_JOB_REFUND:
-                refunded += entry.delta_credits
-            elif entry.reason == CREDIT_REASON_JOB_FINAL:
+        for reason, added, removed in totals:
+            added, removed = int(added), int(removed)
+            if reason == CREDIT_REASON_MONTHLY_GRANT:
+                granted += added + removed
+            elif reason in [CREDIT_REASON_JOB_RESERVE, CREDIT_REASON_COVERAGE_RUN]:
+                used += added - removed
+            elif reason == CREDIT_REASON_JOB_REFUND:
+                refunded += added + removed
+            elif reason == CREDIT_REASON_JOB_FINAL:
                 # Adjustments can be positive (refund) or negative (overrun)
-                if entry.delta_credits > 0:
-                    refunded += entry.delta_credits
-                else:
-                    used += abs(entry.delta_credits)
-            elif entry.reason == CREDIT_REASON_ADMIN_ADJUSTMENT:
-                adjusted += entry.delta_credits
+                refunded += added
+                used -= removed
+            elif reason == CREDIT_REASON_ADMIN_ADJUSTMENT:
+                adjusted += added + removed
         
         balance = granted - used + refunded + adjusted
         
@@ -1,3 +1,4 @@
+import functools
 import json
 import pathlib
 import re
@@ -48,6 +49,7 @@ class GeminiService:
         preserve_formatting: bool = True,
         fix_hyphenation: bool = True,
         min_sentence_length: int = 2,
+        max_attempts_per_stage: Optional[int] = None,
     ) -> None:
         self.client = genai.Client(api_key=current_app.config['GEMINI_API_KEY'])
         self.model_preference = model_preference
@@ -72,6 +74,9 @@ class GeminiService:
         self.repair_multiplier = float(current_app.config.get('GEMINI_REPAIR_MULTIPLIER', 1.5))
         # Maximum repair attempts per unique chunk within a single request
         self.max_repair_attempts = int(current_app.config.get('GEMINI_MAX_REPAIR_ATTEMPTS', 1))
+        # Models tried per fallback stage (own model + cascade models) in
+        # normalize_text; None tries the whole cascade at every stage
+        self.max_attempts_per_stage = max_attempts_per_stage
         # Simple in-request cache to avoid repeating repairs for identical chunks
         self._repair_cache = {}
 
@@ -94,24 +99,46 @@ class GeminiService:
         if base_prompt:
             return base_prompt
 
+        return self._render_prompt(
+            self.sentence_length_limit,
+            self.min_sentence_length,
+            self.ignore_dialogue,
+            self.preserve_formatting,
+            self.fix_hyphenation,
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _render_prompt(
+        sentence_length_limit: int,
+        min_sentence_length: int,
+        ignore_dialogue: bool,
+        preserve_formatting: bool,
+        fix_hyphenation: bool,
+    ) -> str:
+        """Render the full prompt for one combination of settings.
+
+        Memoized: the prompt only depends on these settings, and services are
+        created per job/request with a handful of distinct user configurations.
+        """
         dialogue_rule = (
           "If a sentence is enclosed in quotation marks (« », \" \", or ' '), "
-          "keep it as-is without splitting regardless of length." if self.ignore_dialogue
+          "keep it as-is without splitting regardless of length." if ignore_dialogue
           else "For dialogue, maintain grammatical completeness. Do not split it unless absolutely necessary; "
               "ensure each output sentence preserves the speaker's complete thought."
         )
 
         min_length_rule = (
-            f"Each output sentence must contain at least {self.min_sentence_length} words. "
-            f"If simplification would create a sentence shorter than this (i.e. shorter than {self.min_sentence_length} words), "
+            f"Each output sentence must contain at least {min_sentence_length} words. "
+            f"If simplification would create a sentence shorter than this (i.e. shorter than {min_sentence_length} words), "
             "either rephrase to maintain minimum length or merge it with the previous or next sentence to avoid fragments."
         )
 
         formatting_rules: List[str] = []
-        if self.preserve_formatting:
+        if preserve_formatting:
             formatting_rules.append("Preserve the original quotation marks, italics markers, and ellipses.")
             formatting_rules.append("Keep the literary formatting intact unless it conflicts with readability.")
-        if self.fix_hyphenation:
+        if fix_hyphenation:
             formatting_rules.append(
                 "Hyphenation: If words are split with hyphens because of line breaks (e.g., 'ex- ample'), rejoin them into a single word."
             )
@@ -123,8 +150,8 @@ class GeminiService:
             "🚫 CRITICAL CONSTRAINT: ZERO TOLERANCE FOR FRAGMENTS",
             "═══════════════════════════════════════════════════════════════",
             "",
-            f"ABSOLUTE RULE: Every output sentence MUST be a complete, independent, grammatically correct sentence with {self.min_sentence_length}-{self.sentence_length_limit} words.",
-            f"ABSOLUTE HARD LIMIT: No output sentence may contain more than {self.sentence_length_limit} words. If necessary, rewrite into multiple sentences each not exceeding this limit.",
+            f"ABSOLUTE RULE: Every output sentence MUST be a complete, independent, grammatically correct sentence with {min_sentence_length}-{sentence_length_limit} words.",
+            f"ABSOLUTE HARD LIMIT: No output sentence may contain more than {sentence_length_limit} words. If necessary, rewrite into multiple sentences each not exceeding this limit.",
             "Each sentence must be linguistically complete.",
             min_length_rule,
             "Your task is to extract and process every single sentence from the entire document. Do not skip content.",
@@ -164,8 +191,8 @@ class GeminiService:
             "PROCESS:",
             "REWRITE and PARAPHRASE",
             "1. Read the ENTIRE source text thoroughly",
-            f"2. For sentences ≤ {self.sentence_length_limit} words: Output them unchanged",
-            f"3. For sentences > {self.sentence_length_limit} words: REWRITE them into multiple complete sentences",
+            f"2. For sentences ≤ {sentence_length_limit} words: Output them unchanged",
+            f"3. For sentences > {sentence_length_limit} words: REWRITE them into multiple complete sentences",
             "4. NEVER split at commas, conjunctions, or punctuation alone",
             "5. ALWAYS ensure each output sentence can stand alone grammatically",
             "",
@@ -191,7 +218,7 @@ class GeminiService:
             "✓ Must express a COMPLETE THOUGHT",
             "✓ Must be able to stand alone with ZERO context",
             "✓ Must end with proper punctuation (. ! ? …)",
-            f"✓ Must contain {self.min_sentence_length}-{self.sentence_length_limit} words",
+            f"✓ Must contain {min_sentence_length}-{sentence_length_limit} words",
             "",
             "═══════════════════════════════════════════════════════════════",
             "🔍 FRAGMENT DETECTION TEST",
@@ -253,7 +280,7 @@ class GeminiService:
             "☐ No sentence fragments",
             "☐ No dependent clauses as standalone sentences",
             "☐ No incomplete thoughts",
-            f"☐ All sentences are {self.min_sentence_length}-{self.sentence_length_limit} words",
+            f"☐ All sentences are {min_sentence_length}-{sentence_length_limit} words",
             "☐ JSON is valid and properly formatted",
             "",
             "PROCESS THE ENTIRE TEXT. BEGIN NOW."
@@ -1149,6 +1176,8 @@ class GeminiService:
         
         # Step 2: Try model fallback cascade
         fallback_models = self.MODEL_FALLBACK_CASCADE.get(self.model_preference, [])
+        if self.max_attempts_per_stage is not None:
+            fallback_models = fallback_models[:max(self.max_attempts_per_stage - 1, 0)]
         for fallback_pref in fallback_models:
             fallback_model = self.MODEL_PREFERENCE_MAP.get(fallback_pref)
             if not fallback_model:
@@ -6,9 +6,10 @@ proper versioning, automatic seeding, and administrative capabilities.
 """
 import logging
 import time
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator
 from pathlib import Path
 from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import defer
 from app import db
 from app.models import WordList
 from app.services.wordlist_service import WordListService
@@ -142,28 +143,24 @@ class GlobalWordlistManager:
         if not filepath.exists():
             raise FileNotFoundError(f"Wordlist file not found: {filepath}")
         
-        # Load words from file
-        words = []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                words.append(line)
+        # Load words from file, streamed line by line (never the whole text at once)
+        words = list(GlobalWordlistManager._iter_file_entries(filepath))
         
         if not words:
             raise ValueError(f"No words found in file: {filepath}")
         
         logger.info(f"Loaded {len(words)} words from {filepath}")
         
-        # If setting as default, unmark any existing defaults
+        # If setting as default, unmark any existing defaults with one UPDATE
+        # (no SELECT first, no per-row flush)
         if set_as_default:
-            existing_default = WordList.query.filter_by(is_global_default=True).first()
-            if existing_default:
-                logger.info(f"Unmarking existing default: {existing_default.name}")
-                existing_default.is_global_default = False
+            unmarked = WordList.query.filter_by(is_global_default=True).update(
+                {'is_global_default': False}
+            )
+            if unmarked:
+                logger.info(f"Unmarked {unmarked} existing default wordlist(s)")
         
-        # Create wordlist
+        # Create wordlist, inserted already flagged so the row needs no follow-up UPDATE
         wordlist_service = WordListService()
         wordlist, ingestion_report = wordlist_service.ingest_word_list(
             words=words,
@@ -171,13 +168,10 @@ class GlobalWordlistManager:
             owner_user_id=None,  # Global - no owner
             source_type='file',
             source_ref=str(filepath),
-            fold_diacritics=True
+            fold_diacritics=True,
+            is_global_default=set_as_default
         )
         
-        # Set as default if requested
-        if set_as_default:
-            wordlist.is_global_default = True
-        
         db.session.commit()
         
         logger.info(
@@ -188,15 +182,29 @@ class GlobalWordlistManager:
         
         return wordlist
     
+    @staticmethod
+    def _iter_file_entries(filepath: Path) -> Iterator[str]:
+        """Yield the stripped entries of a wordlist file, skipping blanks and # comments."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+    
     @staticmethod
     def get_global_default() -> Optional[WordList]:
         """
         Get the current global default wordlist.
+
+        ``words_json`` is deferred and loaded on first access, so metadata
+        lookups never pull the full word list.
         
         Returns:
             WordList or None if no global default exists
         """
-        return WordList.query.filter_by(is_global_default=True).first()
+        return WordList.query.options(defer(WordList.words_json)).filter_by(
+            is_global_default=True
+        ).first()
     
     @staticmethod
     def set_global_default(wordlist_id: int) -> WordList:
@@ -218,11 +226,14 @@ class GlobalWordlistManager:
         if wordlist.owner_user_id is not None:
             raise ValueError("Only global wordlists (owner_user_id=None) can be set as default")
         
-        # Unmark existing default
-        existing_default = WordList.query.filter_by(is_global_default=True).first()
-        if existing_default and existing_default.id != wordlist_id:
-            logger.info(f"Unmarking existing default: {existing_default.name}")
-            existing_default.is_global_default = False
+        # Unmark the existing default in one UPDATE; it must run before the new row
+        # is flagged, or the unique default index would briefly see two defaults
+        unmarked = WordList.query.filter(
+            WordList.is_global_default.is_(True),
+            WordList.id != wordlist_id
+        ).update({'is_global_default': False})
+        if unmarked:
+            logger.info(f"Unmarked {unmarked} existing default wordlist(s)")
         
         # Set new default
         wordlist.is_global_default = True
@@ -235,11 +246,15 @@ class GlobalWordlistManager:
     def list_global_wordlists() -> List[WordList]:
         """
         List all global wordlists (those with no owner).
+
+        ``words_json`` is deferred: listings only need metadata.
         
         Returns:
             List of global WordList objects
         """
-        return WordList.query.filter_by(owner_user_id=None).order_by(
+        return WordList.query.options(defer(WordList.words_json)).filter_by(
+            owner_user_id=None
+        ).order_by(
             WordList.is_global_default.desc(),
             WordList.created_at.desc()
         ).all()
@@ -252,8 +267,18 @@ class GlobalWordlistManager:
         Returns:
             Dict with statistics
         """
-        global_wordlists = GlobalWordlistManager.list_global_wordlists()
-        default = GlobalWordlistManager.get_global_default()
+        # Plain rows of the summary columns: no mapped instances to hydrate
+        global_wordlists = WordList.query.with_entities(
+            WordList.id,
+            WordList.name,
+            WordList.normalized_count,
+            WordList.is_global_default
+        ).filter_by(owner_user_id=None).order_by(
+            WordList.is_global_default.desc(),
+            WordList.created_at.desc()
+        ).all()
+        # The default is a global list and sorts first, so no second query is needed
+        default = next((wl for wl in global_wordlists if wl.is_global_default), None)
         
         return {
             'total_global_wordlists': len(global_wordlists),
@@ -6,6 +6,13 @@ import shutil
 import io
 import sys
 
+try:
+    # PyMuPDF (AGPL-3.0): opt-in C-backed reader for the metadata-only fast
+    # path, never a hard dependency; install it separately to enable it
+    import fitz
+except ImportError:  # pragma: no cover - optional dependency
+    fitz = None
+
 
 class PDFService:
     """Service for handling PDF file operations"""
@@ -96,24 +103,23 @@ class PDFService:
         making it suitable for cost estimation before full processing.
         
         Args:
-            file_stream: Optional seekable file-like stream. If not provided,
-                        uses the uploaded file from initialization.
+            file_stream: Optional seekable file-like stream (e.g. an upload's
+                        ``FileStorage.stream``). If not provided, uses the
+                        uploaded file from initialization.
         
         Returns:
             dict: {
                 'page_count': int,
                 'file_size': int (bytes),
-                'image_count': int (estimated, optional)
+                'image_count': int (estimated)
             }
             
         Raises:
             RuntimeError: If PDF is invalid or corrupted
         """
         try:
-            from app.pdf_compat import PdfReader, errors as pdf_errors
-            
             # Use provided stream or the instance file
-            stream = file_stream if file_stream else self.file
+            stream = file_stream if file_stream is not None else self.file
             
             # Ensure stream is seekable and at start
             if hasattr(stream, 'seek'):
@@ -132,27 +138,11 @@ class PDFService:
                 else:
                     file_size = 0
             
-            # Get page count using PdfReader (metadata-only, no text extraction)
-            reader = PdfReader(stream)
-            page_count = len(reader.pages)
-            
-            # Optionally estimate image count by inspecting /XObject resources
-            image_count = 0
-            try:
-                for page in reader.pages:
-                    if '/Resources' in page and '/XObject' in page['/Resources']:
-                        xobject = page['/Resources']['/XObject']
-                        if hasattr(xobject, 'get_object'):
-                            xobject = xobject.get_object()
-                        # Count XObjects that are likely images
-                        for obj in xobject.values() if hasattr(xobject, 'values') else []:
-                            if hasattr(obj, 'get_object'):
-                                obj = obj.get_object()
-                            if hasattr(obj, 'get') and obj.get('/Subtype') == '/Image':
-                                image_count += 1
-            except Exception:
-                # Image counting is optional, don't fail if it doesn't work
-                pass
+            stream_path = self._stream_path(stream)
+            if fitz is not None and stream_path is not None:
+                page_count, image_count = self._count_pages_pymupdf(stream_path)
+            else:
+                page_count, image_count = self._count_pages_pdf_reader(stream)
             
             return {
                 'page_count': page_count,
@@ -164,6 +154,61 @@ class PDFService:
             # Normalize PdfReadError and other backend-specific exceptions
             raise RuntimeError(f'Failed to read PDF metadata: {e}')
 
+    @staticmethod
+    def _stream_path(stream):
+        """Return the on-disk path behind ``stream``, or None for in-memory/spooled streams."""
+        name = getattr(stream, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name
+        return None
+
+    @staticmethod
+    def _count_pages_pymupdf(path) -> tuple[int, int]:
+        """Page and image counts via MuPDF, opened from the file on disk.
+
+        Only used for file-backed streams: MuPDF reads the file lazily, so the
+        upload is never copied into memory. Spooled or in-memory streams go
+        through PdfReader, which seeks within the stream instead.
+        """
+        with fitz.open(path, filetype='pdf') as doc:
+            page_count = doc.page_count
+            image_count = 0
+            try:
+                # get_images only lists the page's image xrefs; nothing is decoded
+                for page in doc:
+                    image_count += len(page.get_images(full=False))
+            except Exception:
+                # Image counting is optional, don't fail if it doesn't work
+                pass
+        return page_count, image_count
+
+    @staticmethod
+    def _count_pages_pdf_reader(stream) -> tuple[int, int]:
+        """Page and image counts via PdfReader (metadata-only, no text extraction)."""
+        from app.pdf_compat import PdfReader
+
+        reader = PdfReader(stream)
+        page_count = len(reader.pages)
+        
+        # Optionally estimate image count by inspecting /XObject resources
+        image_count = 0
+        try:
+            for page in reader.pages:
+                if '/Resources' in page and '/XObject' in page['/Resources']:
+                    xobject = page['/Resources']['/XObject']
+                    if hasattr(xobject, 'get_object'):
+                        xobject = xobject.get_object()
+                    # Count XObjects that are likely images
+                    for obj in xobject.values() if hasattr(xobject, 'values') else []:
+                        if hasattr(obj, 'get_object'):
+                            obj = obj.get_object()
+                        if hasattr(obj, 'get') and obj.get('/Subtype') == '/Image':
+                            image_count += 1
+        except Exception:
+            # Image counting is optional, don't fail if it doesn't work
+            pass
+        return page_count, image_count
+
     def delete_temp_file(self):
         """Delete the temporary file if it exists"""
         if self.temp_file_path and os.path.exists(self.temp_file_path):
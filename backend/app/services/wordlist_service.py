@@ -1,15 +1,34 @@
 """Service for managing vocabulary word lists with normalization and ingestion"""
+import functools
 import logging
 import re
-import unicodedata
 from typing import Dict, List, Set, Tuple, Optional
 from datetime import datetime, timezone
+from sqlalchemy import func
+from sqlalchemy.orm import defer
 from app.extensions import db
 from app.models import WordList, CoverageRun, UserSettings
+from app.utils.linguistics import strip_diacritics
 from app.utils.metrics import wordlists_created_total, wordlist_ingestion_errors_total
 
 logger = logging.getLogger(__name__)
 
+# Leading quotes/spaces plus list numbering ("1. ", "2) "), or trailing quotes/spaces.
+# Same result as strip('"\' ') followed by removing a leading number.
+_EDGE_JUNK_RE = re.compile(r'^[ "\']*(?:\d+[.:\-)]?\s*)?|[ "\']+\Z')
+_ZERO_WIDTH_RE = re.compile(r'[\u200b-\u200f\ufeff]')
+# Elided entry ("l'homme", "qu'il"): group 1 is the lexical head
+_ELISION_HEAD_RE = re.compile(r"^(?:l'|d'|j'|n'|s'|t'|c'|qu')\s*(.+)$", re.IGNORECASE)
+# Variant separators in list entries: |, / or comma, with optional spaces
+_VARIANT_SPLIT_RE = re.compile(r'\s*[|/,]\s*')
+# Common French determiners/possessives/articles skipped when choosing a head token
+_HEAD_TOKEN_SKIP = frozenset({
+    'le', 'la', 'les', 'l', "l'", 'un', 'une', 'des', 'du', 'de',
+    'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses',
+    'notre', 'nos', 'votre', 'vos', 'leur', 'leurs',
+    'ce', 'cette', 'ces', 'cet', "d'", "j'"
+})
+
 
 class WordListService:
     """Handles word list ingestion, normalization, and storage"""
@@ -19,9 +38,12 @@ class WordListService:
         pass
     
     @staticmethod
+    @functools.lru_cache(maxsize=100_000)
     def normalize_word(word: str, fold_diacritics: bool = True) -> str:
         """
         Normalize a single word to its canonical form.
+
+        Memoized: word lists and their variants repeat entries heavily.
         
         For word lists, this extracts the lexical head from elided forms
         (e.g., "l'homme" → "homme") to match against lemmatized text.
@@ -39,19 +61,17 @@ class WordListService:
         # Trim whitespace
         word = word.strip()
 
-        # Remove zero-width characters
-        word = re.sub(r'[\u200b-\u200f\ufeff]', '', word)
+        # Remove zero-width characters (never present in plain ASCII entries)
+        if not word.isascii():
+            word = _ZERO_WIDTH_RE.sub('', word)
 
-        # Remove surrounding quotes and apostrophes which often appear in spreadsheets
-        word = word.strip('"' + "'" + ' ')
-        
-        # Remove leading numbers and punctuation (e.g. "1. avoir" -> "avoir")
-        word = re.sub(r'^\d+[.:\-)]?\s*', '', word)
+        # Remove surrounding quotes and apostrophes which often appear in spreadsheets,
+        # and leading numbering (e.g. "1. avoir" -> "avoir"), in one pass
+        word = _EDGE_JUNK_RE.sub('', word)
 
         # Handle elisions BEFORE removing apostrophes (l', d', j', n', s', t', c', qu')
         # Extract the lexical head after elision for word list matching
-        elision_pattern = r"^(?:l'|d'|j'|n'|s'|t'|c'|qu')\s*(.+)$"
-        match = re.match(elision_pattern, word, re.IGNORECASE)
+        match = _ELISION_HEAD_RE.match(word)
         if match:
             word = match.group(1)
         else:
@@ -63,11 +83,7 @@ class WordListService:
 
         # Fold diacritics if requested
         if fold_diacritics:
-            # Decompose and remove combining marks
-            word = ''.join(
-                c for c in unicodedata.normalize('NFD', word)
-                if unicodedata.category(c) != 'Mn'
-            )
+            word = strip_diacritics(word)
 
         return word.strip()
     
@@ -84,7 +100,7 @@ class WordListService:
             List of variant words
         """
         # Split on |, /, or comma (with optional spaces)
-        variants = re.split(r'\s*[|/,]\s*', word)
+        variants = _VARIANT_SPLIT_RE.split(word)
         return [v.strip() for v in variants if v.strip()]
     
     @staticmethod
@@ -104,18 +120,10 @@ class WordListService:
         if not tokens:
             return phrase
 
-        # Common French determiners/possessives/articles to skip when choosing head
-        skip = {
-            'le', 'la', 'les', 'l', "l'", 'un', 'une', 'des', 'du', 'de',
-            'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses',
-            'notre', 'nos', 'votre', 'vos', 'leur', 'leurs',
-            'ce', 'cette', 'ces', 'cet', "d'", "j'"
-        }
-
         for t in tokens:
             t_clean = t.strip().lower().rstrip("'").strip()
             # If token is not an article/determiner, return it as head
-            if t_clean not in skip and t_clean != '':
+            if t_clean not in _HEAD_TOKEN_SKIP and t_clean != '':
                 return t
 
         # Fallback: return last token if all tokens were skip-words
@@ -128,7 +136,8 @@ class WordListService:
         owner_user_id: Optional[int] = None,
         source_type: str = 'manual',
         source_ref: Optional[str] = None,
-        fold_diacritics: bool = True
+        fold_diacritics: bool = True,
+        is_global_default: bool = False
     ) -> Tuple[WordList, Dict]:
         """
         Ingest a list of words, normalize them, and create a WordList.
@@ -140,6 +149,7 @@ class WordListService:
             source_type: 'csv', 'google_sheet', or 'manual'
             source_ref: Reference to source (file name, Sheet ID, etc.)
             fold_diacritics: Whether to remove diacritics
+            is_global_default: Insert the list already marked as the global default
             
         Returns:
             Tuple of (WordList object, ingestion_report dict)
@@ -170,12 +180,13 @@ class WordListService:
                 # Check for multi-token
                 tokens = variant.split()
                 if len(tokens) > 1:
+                    head_token = self.extract_head_token(variant)
                     ingestion_report['multi_token_entries'].append({
                         'original': variant,
-                        'head_token': self.extract_head_token(variant)
+                        'head_token': head_token
                     })
                     # Use head token for now
-                    variant = self.extract_head_token(variant)
+                    variant = head_token
                 
                 # Normalize
                 normalized = self.normalize_word(variant, fold_diacritics=fold_diacritics)
@@ -199,12 +210,14 @@ class WordListService:
                 # Build alias map
                 alias_map[variant.casefold()] = normalized
         
-        # Store samples (first 20 normalized keys)
-        samples = sorted(list(normalized_keys))[:20]
+        # Sort once: the full list and its samples (first 20 keys) share the order
+        sorted_keys = sorted(normalized_keys)
+        samples = sorted_keys[:20]
         
         ingestion_report['normalized_count'] = len(normalized_keys)
         
-        # Create WordList object with full normalized list
+        # Create WordList object with full normalized list. The whole list is a
+        # single row (words_json), so ingestion costs one INSERT regardless of size.
         wordlist = WordList(
             owner_user_id=owner_user_id,
             name=name,
@@ -212,8 +225,8 @@ class WordListService:
             source_ref=source_ref,
             normalized_count=len(normalized_keys),
             canonical_samples=samples,
-            words_json=sorted(list(normalized_keys)),  # Store full list
-            is_global_default=False
+            words_json=sorted_keys,  # Store full list
+            is_global_default=is_global_default
         )
         
         db.session.add(wordlist)
@@ -241,10 +254,29 @@ class WordListService:
         query = WordListService.get_user_wordlists_query(user_id, include_global)
         return query.all()
     
+    @staticmethod
+    def count_user_wordlists(user_id: int, include_global: bool = True) -> int:
+        """
+        Count word lists accessible to a user with a single COUNT query.
+
+        Args:
+            user_id: User ID
+            include_global: Whether to include global lists
+
+        Returns:
+            Number of accessible word lists
+        """
+        return db.session.query(func.count(WordList.id)).filter(
+            WordListService._user_wordlists_filter(user_id, include_global)
+        ).scalar()
+
     @staticmethod
     def get_user_wordlists_query(user_id: int, include_global: bool = True):
         """
         Get query for word lists accessible to a user.
+
+        The full ``words_json`` list is deferred: listings only need metadata,
+        and the column is loaded on first access when a caller does need it.
         
         Args:
             user_id: User ID
@@ -253,19 +285,22 @@ class WordListService:
         Returns:
             SQLAlchemy query object
         """
+        query = WordList.query.options(defer(WordList.words_json)).filter(
+            WordListService._user_wordlists_filter(user_id, include_global)
+        )
+        return query.order_by(WordList.is_global_default.desc(), WordList.created_at.desc())
+
+    @staticmethod
+    def _user_wordlists_filter(user_id: int, include_global: bool):
+        """Filter clause selecting the word lists accessible to a user."""
         if include_global:
             # Include user's own lists and global lists
-            query = WordList.query.filter(
-                db.or_(
-                    WordList.owner_user_id == user_id,
-                    WordList.owner_user_id.is_(None)
-                )
+            return db.or_(
+                WordList.owner_user_id == user_id,
+                WordList.owner_user_id.is_(None)
             )
-        else:
-            # Only user's own lists
-            query = WordList.query.filter_by(owner_user_id=user_id)
-        
-        return query.order_by(WordList.is_global_default.desc(), WordList.created_at.desc())
+        # Only user's own lists
+        return WordList.owner_user_id == user_id
     
     @staticmethod
     def get_global_default_wordlist() -> Optional[WordList]:
@@ -343,10 +378,11 @@ class WordListService:
                     normalized_keys.add(normalized)
         
         # Update wordlist
-        wordlist.words_json = sorted(list(normalized_keys))
+        sorted_keys = sorted(normalized_keys)
+        wordlist.words_json = sorted_keys
         wordlist.normalized_count = len(normalized_keys)
         if not wordlist.canonical_samples:
-            wordlist.canonical_samples = sorted(list(normalized_keys))[:20]
+            wordlist.canonical_samples = sorted_keys[:20]
         wordlist.updated_at = datetime.now(timezone.utc)
         
         logger.info(f"Refreshed WordList {wordlist.id} with {len(normalized_keys)} normalized words")
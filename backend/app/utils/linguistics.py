@@ -1,83 +1,157 @@
 """Linguistics utilities for French text processing with spaCy"""
+import functools
 import logging
-from typing import List, Dict, Set, Optional, Tuple
+import os
+from types import MappingProxyType
+from typing import List, Dict, Set, FrozenSet, Mapping, Optional, Tuple
 import unicodedata
 import re
 
 logger = logging.getLogger(__name__)
 
-# Lazy loading of spaCy to avoid import errors if not installed
-_nlp = None
+# Precompiled patterns for the hot normalization paths
+_ZERO_WIDTH_RE = re.compile(r'[\u200b-\u200f\ufeff]')
+# The elision prefixes are plain ASCII: ASCII case folding keeps e.g. "ſ'" or the
+# Kelvin sign from matching and skips the Unicode case tables
+_ELISION_RE = re.compile(r"^(?:qu|[ldjnstc])'", re.IGNORECASE | re.ASCII)
+# Leading reflexive prefix (spaCy's "se_" or "s'") and/or contraction, consumed by
+# normalize_french_lemma in one anchored match (input is already lowercased)
+_LEMMA_PREFIX_RE = re.compile(r"(?:se_|s')?(?:(qu|[ldjntcm])')?")
+# Contraction (before the apostrophe) -> full form; shared with the tests, and
+# read-only so the lookup table cannot drift at runtime
+ELISION_EXPANSIONS: Mapping[str, str] = MappingProxyType({
+    "l": "le",
+    "d": "de",
+    "j": "je",
+    "qu": "que",
+    "n": "ne",
+    "t": "te",
+    "c": "ce",
+    "m": "me",
+})
+# Every non-empty match of _LEMMA_PREFIX_RE starts with one of these; most lemmas
+# start with none of them and skip the regex after a single C-level check
+_LEMMA_PREFIX_STARTS = ("se_", "s'") + tuple(f"{c}'" for c in ELISION_EXPANSIONS)
+
+
+def _strip_marks(text: str) -> str:
+    """Decompose (NFD) and drop combining marks."""
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', text)
+        if unicodedata.category(c) != 'Mn'
+    )
+
+
+# Precomposed Latin-1 Supplement / Latin Extended-A letters (é, è, ç, ...) mapped
+# to their folded form, derived from NFD so the table can never disagree with the
+# generic path. Letters NFD leaves alone (œ, æ, ø) are deliberately not mapped.
+_DIACRITIC_FOLD = str.maketrans({
+    c: folded
+    for c in map(chr, range(0xC0, 0x180))
+    if (folded := _strip_marks(c)) != c
+})
+
+
+def strip_diacritics(text: str) -> str:
+    """Fold diacritics (café -> cafe), equivalent to NFD + dropping combining marks.
+
+    French text is covered by a C-level ``str.translate`` table; the NFD pass only
+    runs for code points the table does not cover.
+    """
+    if text.isascii():
+        return text
+    text = text.translate(_DIACRITIC_FOLD)
+    if text.isascii():
+        return text
+    return _strip_marks(text)
+
 
+def _expand_lemma_prefix(lemma: str) -> str:
+    """Strip a reflexive prefix and expand one elision of a lowercased lemma.
+
+    spaCy often lemmatizes reflexive verbs with a "se_" or "s'" prefix
+    (e.g., "se_laver", "s'appeler"); it goes first so the base verb form can
+    match word lists, and "s'" is never read as a contraction. Both are
+    consumed in a single anchored match.
+    Note: "s'" as an elision of "si" (e.g., "s'il" = "si il") won't appear in
+    lemma form because spaCy tokenizes it as separate tokens.
+    """
+    if not lemma.startswith(_LEMMA_PREFIX_STARTS):
+        return lemma
+    match = _LEMMA_PREFIX_RE.match(lemma)
+    if not match.end():
+        return lemma
+    contraction = match.group(1)
+    lemma = lemma[match.end():]
+    if contraction:
+        # Replace the contraction with the full form
+        lemma = ELISION_EXPANSIONS[contraction] + lemma
+    return lemma
 
+
+class DummyNLP:
+    """Whitespace tokenizer used when no spaCy model can be loaded (graceful degradation)."""
+
+    def __call__(self, text):
+        class DummyDoc:
+            def __iter__(self):
+                # Simple whitespace tokenization fallback
+                for word in text.split():
+                    yield type('Token', (), {'text': word, 'lemma_': word.lower()})()
+        return DummyDoc()
+
+
+@functools.lru_cache(maxsize=1)
 def get_nlp():
-    """Lazy load spaCy French model.
+    """Lazy load spaCy French model, once per process.
 
     Notes:
+        - The loaded pipeline (or the DummyNLP fallback) is memoized, so repeated
+          calls never pay the ``spacy.load()`` cost again - including when no model
+          is installed. Call ``get_nlp.cache_clear()`` to force a reload.
         - To reduce memory usage, we disable heavy components not needed for our
           use-cases (parser, ner). POS tagging and lemmatization remain enabled.
         - Model name can be controlled via SPACY_MODEL env var.
         - Components to disable can be controlled via SPACY_DISABLE env var
           (comma-separated), defaults to "parser,ner".
     """
-    global _nlp
-    if _nlp is None:
-        # Allow an environment override to force the DummyNLP (useful on
-        # memory-constrained hosts where loading any spaCy model would cause
-        # worker OOMs). Set SPACY_FORCE_DUMMY=true to enable.
-        import os
-        force_dummy = os.environ.get('SPACY_FORCE_DUMMY', 'false').lower() in ('1', 'true', 'yes')
-        if force_dummy:
-            logger.info('SPACY_FORCE_DUMMY is set; using DummyNLP to avoid loading spaCy model')
-            class DummyNLP:
-                def __call__(self, text):
-                    class DummyDoc:
-                        def __iter__(self):
-                            # Simple whitespace tokenization fallback
-                            for word in text.split():
-                                yield type('Token', (), {'text': word, 'lemma_': word.lower()})()
-                    return DummyDoc()
-            _nlp = DummyNLP()
-            return _nlp
-
-        try:
-            import spacy
-            # Prefer the medium French model, but fall back to the small model if the
-            # medium model isn't available. Avoid attempting an automatic download
-            # inside worker processes because network access or pip installs can
-            # fail in ephemeral environments (and was observed to produce HTTP 404
-            # errors). If neither model is available, fall back to the DummyNLP
-            # which provides a graceful degradation.
-            import os
-            preferred = os.environ.get("SPACY_MODEL", "fr_core_news_md")
-            tried = []
-            # Determine disabled components to save RAM
-            disable_env = os.environ.get("SPACY_DISABLE", "parser,ner").strip()
-            disable = [c.strip() for c in disable_env.split(",") if c.strip()]
-
-            for model in (preferred, "fr_core_news_sm"):
-                if model in tried:
-                    continue
-                tried.append(model)
-                try:
-                    _nlp = spacy.load(model, disable=disable)
-                    logger.info("Loaded spaCy French model: %s (disable=%s)", model, ",".join(disable))
-                    break
-                except OSError:
-                    logger.warning("spaCy model %s not found, will try next fallback", model)
-        except Exception as e:
-            logger.error(f"Failed to load spaCy model: {e}")
-            # Return a dummy object that will cause graceful degradation
-            class DummyNLP:
-                def __call__(self, text):
-                    class DummyDoc:
-                        def __iter__(self):
-                            # Simple whitespace tokenization fallback
-                            for word in text.split():
-                                yield type('Token', (), {'text': word, 'lemma_': word.lower()})()
-                    return DummyDoc()
-            _nlp = DummyNLP()
-    return _nlp
+    # Allow an environment override to force the DummyNLP (useful on
+    # memory-constrained hosts where loading any spaCy model would cause
+    # worker OOMs). Set SPACY_FORCE_DUMMY=true to enable.
+    force_dummy = os.environ.get('SPACY_FORCE_DUMMY', 'false').lower() in ('1', 'true', 'yes')
+    if force_dummy:
+        logger.info('SPACY_FORCE_DUMMY is set; using DummyNLP to avoid loading spaCy model')
+        return DummyNLP()
+
+    try:
+        import spacy
+        # Prefer the medium French model, but fall back to the small model if the
+        # medium model isn't available. Avoid attempting an automatic download
+        # inside worker processes because network access or pip installs can
+        # fail in ephemeral environments (and was observed to produce HTTP 404
+        # errors). If neither model is available, fall back to the DummyNLP
+        # which provides a graceful degradation.
+        preferred = os.environ.get("SPACY_MODEL", "fr_core_news_md")
+        tried = []
+        # Determine disabled components to save RAM
+        disable_env = os.environ.get("SPACY_DISABLE", "parser,ner").strip()
+        disable = [c.strip() for c in disable_env.split(",") if c.strip()]
+
+        for model in (preferred, "fr_core_news_sm"):
+            if model in tried:
+                continue
+            tried.append(model)
+            try:
+                nlp = spacy.load(model, disable=disable)
+                logger.info("Loaded spaCy French model: %s (disable=%s)", model, ",".join(disable))
+                return nlp
+            except OSError:
+                logger.warning("spaCy model %s not found, will try next fallback", model)
+        logger.error("No spaCy French model available (tried %s); using DummyNLP", ", ".join(tried))
+    except Exception as e:
+        logger.error(f"Failed to load spaCy model: {e}")
+    # Return a dummy object that will cause graceful degradation
+    return DummyNLP()
 
 
 def preload_spacy(model_name: Optional[str] = None) -> None:
@@ -92,7 +166,6 @@ def preload_spacy(model_name: Optional[str] = None) -> None:
     """
     # If a specific model is requested, honor it via environment override for this load
     if model_name:
-        import os
         os.environ.setdefault("SPACY_MODEL", model_name)
     nlp = get_nlp()
     # Touch the pipeline to ensure it's fully initialized
@@ -106,9 +179,13 @@ class LinguisticsUtils:
     """Utilities for French text processing, tokenization, and lemmatization"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=100_000)
     def normalize_text(text: str, fold_diacritics: bool = True) -> str:
         """
         Normalize text for matching.
+
+        Pure function of its arguments, memoized because corpora repeat the
+        same lemmas many times.
         
         Args:
             text: Input text
@@ -123,15 +200,15 @@ class LinguisticsUtils:
         # Trim and casefold
         text = text.strip().casefold()
         
-        # Remove zero-width characters
-        text = re.sub(r'[\u200b-\u200f\ufeff]', '', text)
-        
-        # Fold diacritics if requested
-        if fold_diacritics:
-            text = ''.join(
-                c for c in unicodedata.normalize('NFD', text)
-                if unicodedata.category(c) != 'Mn'
-            )
+        # Plain ASCII (most French function words) has no zero-width characters
+        # or diacritics: skip both passes
+        if not text.isascii():
+            # Remove zero-width characters
+            text = _ZERO_WIDTH_RE.sub('', text)
+            
+            # Fold diacritics if requested (translate table, see strip_diacritics)
+            if fold_diacritics:
+                text = strip_diacritics(text)
         
         # Strip apostrophes which can cause matching issues
         text = text.replace("'", "")
@@ -150,21 +227,16 @@ class LinguisticsUtils:
         Returns:
             Word with elision removed
         """
-        # Elision prefixes in French (case-insensitive)
-        elision_prefixes = ["l'", "d'", "j'", "n'", "s'", "t'", "c'", "qu'"]
-
-        word_lower = word.lower()
-        for prefix in elision_prefixes:
-            if word_lower.startswith(prefix):
-                return word[len(prefix):]
-
-        return word
+        # Elision prefixes in French (case-insensitive): l' d' j' n' s' t' c' qu'
+        return _ELISION_RE.sub('', word, count=1)
 
     @staticmethod
+    @functools.lru_cache(maxsize=100_000)
     def normalize_french_lemma(lemma: str) -> str:
         """
         Enhanced French lemma normalization for better word matching.
         Handles French-specific quirks before matching against word lists.
+        Memoized like normalize_text: function-word lemmas repeat heavily.
 
         This function addresses:
         - Elisions: l' → le, d' → de, j' → je, qu' → que, etc.
@@ -183,34 +255,7 @@ class LinguisticsUtils:
         # Trim and lowercase
         lemma = lemma.strip().lower()
 
-    # Handle reflexive pronouns FIRST: spaCy often lemmatizes reflexive verbs
-        # with a "se_" or "s'" prefix (e.g., "se_laver", "s'appeler").
-        # Strip this prefix to match against word lists that contain the base verb form.
-        # Note: "s'" as an elision of "si" (e.g., "s'il" = "si il") won't appear in
-        # lemma form because spaCy tokenizes it as separate tokens.
-        if lemma.startswith("se_"):
-            lemma = lemma[3:]  # Remove "se_"
-        elif lemma.startswith("s'"):
-            lemma = lemma[2:]  # Remove "s'"
-
-        # Handle elisions: expand common contractions
-        # Note: We do this AFTER reflexive pronoun handling to avoid confusion with s'
-        elision_expansions = {
-            "l'": "le",
-            "d'": "de",
-            "j'": "je",
-            "qu'": "que",
-            "n'": "ne",
-            "t'": "te",
-            "c'": "ce",
-            "m'": "me",
-        }
-
-        for contraction, expansion in elision_expansions.items():
-            if lemma.startswith(contraction):
-                # Replace the contraction with the full form
-                lemma = expansion + lemma[len(contraction):]
-                break
+        lemma = _expand_lemma_prefix(lemma)
 
         # Remove any remaining apostrophes that might interfere with matching
         lemma = lemma.replace("'", "")
@@ -220,6 +265,38 @@ class LinguisticsUtils:
 
         return lemma
     
+    @staticmethod
+    @functools.lru_cache(maxsize=100_000)
+    def normalize_lemma_full(lemma: str, fold_diacritics: bool = True) -> str:
+        """
+        ``normalize_text(normalize_french_lemma(lemma), fold_diacritics)`` in one call.
+
+        Tokenization runs this for every token: one cache lookup and no
+        intermediate string, and the casefold/zero-width/diacritic pass is skipped
+        for plain ASCII lemmas.
+
+        Args:
+            lemma: Input lemma to normalize
+            fold_diacritics: Whether to remove diacritics
+
+        Returns:
+            Normalized key suitable for word list matching
+        """
+        if not lemma:
+            return ""
+
+        lemma = _expand_lemma_prefix(lemma.strip().lower())
+
+        # Apostrophes go before whitespace is collapsed, as in normalize_french_lemma
+        lemma = " ".join(lemma.replace("'", "").split())
+
+        if not lemma.isascii():
+            lemma = _ZERO_WIDTH_RE.sub('', lemma.casefold())
+            if fold_diacritics:
+                lemma = strip_diacritics(lemma)
+
+        return lemma
+
     @staticmethod
     def tokenize_and_lemmatize(
         text: str,
@@ -261,10 +338,11 @@ class LinguisticsUtils:
             else:
                 surface_for_norm = surface
 
-            # Apply French-specific lemma normalization first (handles elisions, reflexives)
-            # then apply general text normalization (diacritics, etc.)
-            lemma_normalized = LinguisticsUtils.normalize_french_lemma(lemma if lemma else surface_for_norm)
-            normalized = LinguisticsUtils.normalize_text(lemma_normalized, fold_diacritics=fold_diacritics)
+            # French-specific lemma normalization (elisions, reflexives) followed by
+            # general text normalization (diacritics, etc.), fused into one call
+            normalized = LinguisticsUtils.normalize_lemma_full(
+                lemma if lemma else surface_for_norm, fold_diacritics=fold_diacritics
+            )
 
             if not normalized:
                 logger.debug(f"Skipping empty normalized token from lemma '{lemma}'")
@@ -332,14 +410,35 @@ class LinguisticsUtils:
             fold_diacritics=fold_diacritics,
             handle_elisions=handle_elisions
         )
-        
-        if not tokens:
+
+        return LinguisticsUtils.calculate_in_list_ratio_from_lemmas(
+            [token['normalized'] for token in tokens],
+            wordlist_keys
+        )
+
+    @staticmethod
+    def calculate_in_list_ratio_from_lemmas(
+        lemmas: List[str],
+        wordlist_keys: FrozenSet[str]
+    ) -> Tuple[float, int, int]:
+        """
+        Calculate the in-list ratio for an already lemmatized sentence.
+
+        Use this when the normalized lemmas are at hand (e.g. from
+        CoverageService.build_sentence_index) to avoid re-running spaCy.
+
+        Args:
+            lemmas: Normalized lemmas of the sentence (duplicates count)
+            wordlist_keys: Set of normalized word keys
+
+        Returns:
+            Tuple of (ratio, matched_count, total_count)
+        """
+        if not lemmas:
             return 0.0, 0, 0
-        
-        matched, _ = LinguisticsUtils.match_tokens_to_wordlist(tokens, wordlist_keys)
-        
-        ratio = len(matched) / len(tokens) if tokens else 0.0
-        return ratio, len(matched), len(tokens)
+
+        matched = sum(1 for lemma in lemmas if lemma in wordlist_keys)
+        return matched / len(lemmas), matched, len(lemmas)
     
     @staticmethod
     def find_word_in_sentence(
@@ -0,0 +1,46 @@
+"""Enforce a single global default word list with a partial unique index
+
+Revision ID: wordlist_default_ux
+Revises: user_session_v1
+Create Date: 2025-10-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'wordlist_default_ux'
+down_revision = 'user_session_v1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Workers that raced during seeding may have left several defaults behind;
+    # keep the oldest (as GlobalWordlistManager.cleanup_duplicate_defaults does)
+    word_lists = sa.table(
+        'word_lists',
+        sa.column('id', sa.Integer),
+        sa.column('is_global_default', sa.Boolean),
+    )
+    oldest_default = (
+        sa.select(sa.func.min(word_lists.c.id))
+        .where(word_lists.c.is_global_default.is_(True))
+        .scalar_subquery()
+    )
+    op.execute(
+        word_lists.update()
+        .where(word_lists.c.is_global_default.is_(True), word_lists.c.id != oldest_default)
+        .values(is_global_default=False)
+    )
+
+    op.create_index(
+        'ux_wordlist_global_default', 'word_lists', ['is_global_default'], unique=True,
+        postgresql_where=sa.text('is_global_default'),
+        sqlite_where=sa.text('is_global_default = 1'),
+    )
+
+
+def downgrade():
+    op.drop_index('ux_wordlist_global_default', table_name='word_lists')
@@ -1,14 +1,269 @@
 import os
-import sys
+import sqlite3
+import tempfile
+from unittest.mock import MagicMock, patch
 
-# Ensure the repository root (parent of backend/) is on sys.path so tests
-# can import the top-level `app` shim package (app/__init__.py).
-HERE = os.path.dirname(os.path.abspath(__file__))
-BACKEND_DIR = os.path.dirname(HERE)
-REPO_ROOT = os.path.dirname(BACKEND_DIR)
+import pytest
 
-if REPO_ROOT not in sys.path:
-    sys.path.insert(0, REPO_ROOT)
+# sys.path (backend/ for ``app`` and ``config``, then the repository root) is set
+# once by the ``pythonpath`` option in pyproject.toml; no module inserts paths itself.
 
-# Optionally expose global constants for tests
-REPO_ROOT_PATH = REPO_ROOT
+# Tests that build the app from the default Config get a throwaway SQLite file
+# per pytest-xdist worker ("master" when not distributed) instead of backend/app.db
+# or whatever DATABASE_URL points at, so parallel workers never share a database.
+# Must run before config.py is imported: Config reads DATABASE_URL at class creation.
+WORKER_ID = os.environ.get('PYTEST_XDIST_WORKER', 'master')
+TEST_DB_PATH = os.path.join(tempfile.gettempdir(), f'frenchnoveltool-test-{WORKER_ID}.db')
+if os.path.exists(TEST_DB_PATH):
+    os.remove(TEST_DB_PATH)
+os.environ['DATABASE_URL'] = f'sqlite:///{TEST_DB_PATH}'
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
+
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from flask_sqlalchemy.session import Session  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from config import Config  # noqa: E402
+
+
+@event.listens_for(Engine, 'connect')
+def _throwaway_sqlite_pragmas(dbapi_connection, connection_record):
+    """Test databases are throwaway: no rollback journal on disk and no fsync.
+
+    Applies to every SQLite engine the tests build, including apps created from
+    the default Config on the per-worker file database; a no-op for ``:memory:``.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=MEMORY')
+        cursor.execute('PRAGMA synchronous=OFF')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+
+class TestConfig(Config):
+    """In-memory SQLite configuration shared by the transactional (``db_session``) tests"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    RATELIMIT_ENABLED = False
+    JWT_SECRET_KEY = 'test-secret-key'
+    # Session-scoped tokens are signed once and must outlive any run
+    JWT_ACCESS_TOKEN_EXPIRES = False
+    GOOGLE_CLIENT_ID = 'test_client_id'
+    GOOGLE_CLIENT_SECRET = 'test_client_secret'
+    # Pin the per-query hooks off so the ledger tests' many small queries pay no
+    # logging or recording callbacks, whatever the base config or env turns on
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_RECORD_QUERIES = False
+    PROPAGATE_EXCEPTIONS = True
+    # One shared in-memory database: StaticPool hands every checkout the same
+    # connection (no pool sizing or pre-ping), usable from the test client's threads
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False},
+    }
+
+
+class _ConnectionBoundSession(Session):
+    """Session that always runs on the connection it was created with.
+
+    Flask-SQLAlchemy's ``get_bind`` resolves to the app engine, which would open a
+    second transaction next to the test's outer one.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        return bind if bind is not None else self.bind
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Create the Flask app once per session; schema is created a single time.
+
+    Under pytest-xdist every worker is its own process with its own in-memory
+    database, so schema setup needs no cross-worker locking.
+    Modules with their own ``app`` fixture override this one.
+    """
+    from app import create_app, db
+
+    app = create_app(TestConfig)
+
+    with app.app_context():
+        # pysqlite's legacy transaction handling defers BEGIN and breaks SAVEPOINT;
+        # let SQLAlchemy emit BEGIN itself so per-test rollbacks are honoured.
+        # StaticPool holds a single connection that already exists at this point.
+        with db.engine.connect() as connection:
+            connection.connection.driver_connection.isolation_level = None
+
+        @event.listens_for(db.engine, 'begin')
+        def _emit_begin(conn):
+            conn.exec_driver_sql('BEGIN')
+
+        db.create_all()
+
+    yield app
+
+    with app.app_context():
+        # No drop_all(): the schema lives only in the in-memory database, which
+        # goes away with the StaticPool connection that dispose() closes
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def db_session(app):
+    """Run a test in an app context inside an outer transaction rolled back at teardown.
+
+    ``db.session`` is rebound to a session joined to the outer transaction via
+    SAVEPOINTs, so ``commit()`` calls made by the services never persist across tests.
+    """
+    from app import db
+
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        session = db._make_scoped_session(options={
+            'bind': connection,
+            'binds': {},
+            'class_': _ConnectionBoundSession,
+            'join_transaction_mode': 'create_savepoint',
+            # Instances stay loaded across the services' commits: every change goes
+            # through this one session, so there is nothing stale to re-SELECT
+            'expire_on_commit': False,
+        })
+        original_session = db.session
+        db.session = session
+
+        yield session
+
+        session.remove()
+        db.session = original_session
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope='session')
+def _test_user_id(app):
+    """Insert the test user once per session, outside any per-test transaction"""
+    from app import db
+    from app.models import User
+
+    with app.app_context():
+        user = User(
+            email='test@example.com',
+            name='Test User',
+            google_id='test_google_id',
+            is_active=True,
+            google_access_token='test_access_token',
+            google_refresh_token='test_refresh_token'
+        )
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.remove()
+    return user_id
+
+
+@pytest.fixture
+def test_user(db_session, _test_user_id):
+    """The session-wide test user, loaded into this test's session; changes roll back"""
+    from app import db
+    from app.models import User
+
+    return db.session.get(User, _test_user_id)
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the shared app"""
+    return app.test_client()
+
+
+@pytest.fixture
+def app_context(app):
+    """Application context on the shared app, for services that read current_app"""
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def gemini_client():
+    """Patch google.genai.Client; yields the client instance every GeminiService gets"""
+    with patch('google.genai.Client') as mock_client_class:
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+        yield mock_client
+
+
+@pytest.fixture(scope='session')
+def auth_headers(app, _test_user_id):
+    """JWT auth headers for the session-wide test user, signed once per session"""
+    with app.app_context():
+        access_token = create_access_token(identity=str(_test_user_id))
+    return {'Authorization': f'Bearer {access_token}'}
+
+
+# Transaction bookkeeping (including the SAVEPOINTs of the rollback fixtures)
+# is not counted towards a test's query budget
+_TRANSACTION_CONTROL = ('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK', 'COMMIT')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Enforce ``@pytest.mark.max_queries(n)`` on tests that use the ``app`` fixture.
+
+    Only statements issued by the test body are counted (fixture setup is not),
+    so the budget guards service code against N+1 regressions.
+    """
+    marker = item.get_closest_marker('max_queries')
+    app = item.funcargs.get('app') if marker else None
+    if app is None:
+        yield
+        return
+
+    from sqlalchemy import event
+    from app import db
+
+    with app.app_context():
+        engine = db.engine
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count_statement)
+    try:
+        outcome = yield
+    finally:
+        event.remove(engine, 'before_cursor_execute', count_statement)
+
+    limit = marker.args[0]
+    if outcome.excinfo is None and len(statements) > limit:
+        issued = '\n'.join(f'  {statement}' for statement in statements)
+        outcome.force_exception(pytest.fail.Exception(
+            f'{item.name} issued {len(statements)} SQL statements '
+            f'(max_queries={limit}):\n{issued}',
+            pytrace=False,
+        ))
+
+
+@pytest.fixture(autouse=True)
+def clear_normalization_caches():
+    """Keep tests hermetic by resetting memoized normalization helpers."""
+    yield
+    from app.services.wordlist_service import WordListService
+    from app.utils.linguistics import LinguisticsUtils
+
+    WordListService.normalize_word.cache_clear()
+    LinguisticsUtils.normalize_text.cache_clear()
+    LinguisticsUtils.normalize_french_lemma.cache_clear()
+    LinguisticsUtils.normalize_lemma_full.cache_clear()
@@ -1,52 +1,11 @@
 """Tests for Batch Coverage Mode functionality"""
-import pytest
-from app import create_app, db
-from app.models import User, WordList, CoverageRun, CoverageAssignment
 from app.services.coverage_service import CoverageService
-from config import Config
-
-
-class TestConfig(Config):
-    """Test configuration that works with SQLite"""
-    TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    # Override engine options for SQLite compatibility
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True
-    }
-
-
-@pytest.fixture(scope='function')
-def app():
-    """Create application for testing"""
-    app = create_app(config_class=TestConfig)
-
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
-
-@pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='test123',
-        is_active=True
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
 
 
 class TestBatchCoverageMode:
     """Tests for batch coverage analysis"""
     
-    def test_batch_coverage_basic(self, app):
+    def test_batch_coverage_basic(self):
         """Test basic batch coverage with two sources"""
         # Define a simple wordlist
         wordlist_keys = {'chat', 'chien', 'maison', 'voiture', 'livre', 'table', 'chaise', 'porte'}
@@ -107,7 +66,7 @@ class TestBatchCoverageMode:
         assert 'learning_set' in stats
         assert len(stats['learning_set']) > 0
     
-    def test_batch_coverage_sequential_reduction(self, app):
+    def test_batch_coverage_sequential_reduction(self):
         """Test that batch mode reduces uncovered words sequentially"""
         # Define wordlist
         wordlist_keys = {'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit'}
@@ -159,7 +118,7 @@ class TestBatchCoverageMode:
         if len(breakdown) > 2:
             assert breakdown[2]['words_remaining'] <= breakdown[1]['words_remaining']
     
-    def test_batch_coverage_empty_source(self, app):
+    def test_batch_coverage_empty_source(self):
         """Test batch coverage handles empty sources gracefully"""
         wordlist_keys = {'test', 'word'}
         
@@ -185,7 +144,7 @@ class TestBatchCoverageMode:
         # Should process at least source 1
         assert stats['sources_processed'] >= 1
     
-    def test_batch_coverage_vs_single_coverage(self, app):
+    def test_batch_coverage_vs_single_coverage(self):
         """Compare batch coverage efficiency vs single combined source"""
         wordlist_keys = {'maison', 'chat', 'livre', 'table'}
         
@@ -228,7 +187,7 @@ class TestBatchCoverageMode:
         assert 'source_breakdown' in stats_batch
         assert len(stats_batch['source_breakdown']) == 2
     
-    def test_batch_coverage_respects_sentence_limit(self, app):
+    def test_batch_coverage_respects_sentence_limit(self):
         """Test that batch coverage respects the target_count (sentence_limit)"""
         # Define a wordlist with many words to ensure we get more sentences than our limit
         wordlist_keys = {'un', 'deux', 'trois', 'quatre', 'cinq', 'six', 'sept', 'huit', 'neuf', 'dix'}
@@ -294,7 +253,7 @@ class TestBatchCoverageMode:
                 assert learning_set[i]['score'] >= learning_set[i + 1]['score'], \
                     "Learning set should be sorted by score (descending)"
     
-    def test_batch_coverage_metadata_completeness(self, app):
+    def test_batch_coverage_metadata_completeness(self):
         """Test that batch coverage includes all required metadata in learning_set"""
         wordlist_keys = {'chat', 'chien', 'maison'}
         
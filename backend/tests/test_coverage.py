@@ -1,92 +1,56 @@
 """Tests for Vocabulary Coverage Tool functionality"""
+import gc
+import unicodedata
+
 import pytest
-from app import create_app, db
+from app import db
 from app.models import User, WordList, CoverageRun, CoverageAssignment, UserSettings
 from app.services.wordlist_service import WordListService
 from app.services.coverage_service import CoverageService
-from app.utils.linguistics import LinguisticsUtils
-
-
-@pytest.fixture(scope='function')
-def app():
-    """Create application for testing"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
+from app.utils.linguistics import LinguisticsUtils, _DIACRITIC_FOLD, strip_diacritics
 
 
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
-
-
-@pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='test123',
-        is_active=True
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
+@pytest.fixture(autouse=True)
+def _collect_garbage():
+    """Reclaim ORM objects (and their identity maps) left behind by each test"""
+    yield
+    gc.collect()
 
 
 class TestWordListService:
     """Tests for WordListService"""
     
-    def test_normalize_word_basic(self):
-        """Test basic word normalization"""
-        service = WordListService()
-        
+    @pytest.mark.parametrize("word,kwargs,expected", [
         # Basic normalization
-        assert service.normalize_word("Bonjour") == "bonjour"
-        assert service.normalize_word("  HELLO  ") == "hello"
-    
-    def test_normalize_word_diacritics(self):
-        """Test diacritic folding"""
-        service = WordListService()
-        
-        # With diacritics folding
-        assert service.normalize_word("café", fold_diacritics=True) == "cafe"
-        assert service.normalize_word("élève", fold_diacritics=True) == "eleve"
-        
-        # Without diacritics folding
-        assert service.normalize_word("café", fold_diacritics=False) == "café"
-    
-    def test_normalize_word_elision(self):
-        """Test elision handling"""
-        service = WordListService()
-        
+        ("Bonjour", {}, "bonjour"),
+        ("  HELLO  ", {}, "hello"),
+        # Diacritic folding
+        ("café", {"fold_diacritics": True}, "cafe"),
+        ("élève", {"fold_diacritics": True}, "eleve"),
+        ("café", {"fold_diacritics": False}, "café"),
         # Elisions should extract the head word
-        assert service.normalize_word("l'homme") == "homme"
-        assert service.normalize_word("d'abord") == "abord"
-        assert service.normalize_word("j'ai") == "ai"
+        ("l'homme", {}, "homme"),
+        ("d'abord", {}, "abord"),
+        ("j'ai", {}, "ai"),
+        # Spreadsheet quoting and list numbering
+        ('"1. avoir"', {}, "avoir"),
+        ("' 12) chat '", {}, "chat"),
+        ("'\"'", {}, ""),
+    ])
+    def test_normalize_word(self, word, kwargs, expected):
+        """Test word normalization, diacritic folding and elision handling"""
+        assert WordListService.normalize_word(word, **kwargs) == expected
     
-    def test_split_variants(self):
+    @pytest.mark.parametrize("entry,expected", [
+        ("chat|chats", ["chat", "chats"]),  # Pipe separator
+        ("bon/bonne", ["bon", "bonne"]),  # Slash separator
+        ("simple", ["simple"]),  # No separators
+    ])
+    def test_split_variants(self, entry, expected):
         """Test variant splitting"""
-        service = WordListService()
-        
-        # Pipe separator
-        assert service.split_variants("chat|chats") == ["chat", "chats"]
-        
-        # Slash separator
-        assert service.split_variants("bon/bonne") == ["bon", "bonne"]
-        
-        # No separators
-        assert service.split_variants("simple") == ["simple"]
+        assert WordListService.split_variants(entry) == expected
     
-    def test_ingest_word_list(self, app, sample_user):
+    def test_ingest_word_list(self, app, test_user):
         """Test word list ingestion"""
         service = WordListService()
         
@@ -101,13 +65,13 @@ class TestWordListService:
         wordlist, report = service.ingest_word_list(
             words=words,
             name="Test List",
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             source_type='manual'
         )
         
         # Check that list was created
         assert wordlist.name == "Test List"
-        assert wordlist.owner_user_id == sample_user.id
+        assert wordlist.owner_user_id == test_user.id
         assert wordlist.normalized_count > 0
         
         # Check ingestion report
@@ -115,7 +79,7 @@ class TestWordListService:
         assert report['normalized_count'] > 0
         assert len(report['duplicates']) >= 0  # May have duplicates
     
-    def test_get_user_wordlists(self, app, sample_user):
+    def test_get_user_wordlists(self, app, test_user):
         """Test retrieving user word lists"""
         service = WordListService()
         
@@ -123,7 +87,7 @@ class TestWordListService:
         wordlist, _ = service.ingest_word_list(
             words=["test"],
             name="User List",
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             source_type='manual'
         )
         db.session.commit()
@@ -137,13 +101,15 @@ class TestWordListService:
         )
         db.session.commit()
         
-        # Get all lists for user
-        lists = service.get_user_wordlists(sample_user.id, include_global=True)
-        assert len(lists) >= 2
-        
-        # Get only user lists
-        user_lists = service.get_user_wordlists(sample_user.id, include_global=False)
-        assert len(user_lists) >= 1
+        # Count all lists for user
+        assert service.count_user_wordlists(test_user.id, include_global=True) >= 2
+
+        # Count only user lists
+        assert service.count_user_wordlists(test_user.id, include_global=False) >= 1
+
+        # Listing returns the same rows
+        lists = service.get_user_wordlists(test_user.id, include_global=True)
+        assert {wl.name for wl in lists} >= {"User List", "Global List"}
 
 
 class TestLinguisticsUtils:
@@ -158,12 +124,33 @@ class TestLinguisticsUtils:
         """Test diacritic folding in text"""
         assert LinguisticsUtils.normalize_text("café", fold_diacritics=True) == "cafe"
         assert LinguisticsUtils.normalize_text("café", fold_diacritics=False) == "café"
+
+    @pytest.mark.parametrize("text,expected", [
+        ("élève", "eleve"),
+        ("garçon", "garcon"),
+        ("ÂGE", "AGE"),
+        ("cœur", "cœur"),  # not a diacritic: NFD leaves ligatures alone
+        ("e\u0301te\u0301", "ete"),  # decomposed input goes through the NFD path
+    ])
+    def test_strip_diacritics(self, text, expected):
+        """Test table-driven diacritic folding"""
+        assert strip_diacritics(text) == expected
+
+    def test_strip_diacritics_covers_french_letters(self):
+        """Every accented French letter is folded by the translate table alone"""
+        letters = "àâäéèêëîïôöùûüÿçÀÂÄÉÈÊËÎÏÔÖÙÛÜŸÇ"
+        folded = letters.translate(_DIACRITIC_FOLD)
+        assert folded.isascii()
+        assert folded == unicodedata.normalize('NFD', letters).encode('ascii', 'ignore').decode()
     
-    def test_handle_elision(self):
+    @pytest.mark.parametrize("word,expected", [
+        ("l'homme", "homme"),
+        ("d'accord", "accord"),
+        ("simple", "simple"),
+    ])
+    def test_handle_elision(self, word, expected):
         """Test elision handling"""
-        assert LinguisticsUtils.handle_elision("l'homme") == "homme"
-        assert LinguisticsUtils.handle_elision("d'accord") == "accord"
-        assert LinguisticsUtils.handle_elision("simple") == "simple"
+        assert LinguisticsUtils.handle_elision(word) == expected
     
     def test_tokenize_and_lemmatize(self):
         """Test tokenization and lemmatization"""
@@ -197,6 +184,19 @@ class TestLinguisticsUtils:
         )
         assert 0 < ratio < 1.0
 
+    def test_calculate_in_list_ratio_from_lemmas(self):
+        """Test in-list ratio calculation on pre-lemmatized tokens"""
+        wordlist_keys = frozenset({'le', 'chat', 'manger'})
+
+        ratio, matched, total = LinguisticsUtils.calculate_in_list_ratio_from_lemmas(
+            ['le', 'chat', 'aimer', 'le', 'poisson'], wordlist_keys
+        )
+        assert (matched, total) == (3, 5)
+        assert ratio == pytest.approx(0.6)
+
+        empty = LinguisticsUtils.calculate_in_list_ratio_from_lemmas([], wordlist_keys)
+        assert empty == (0.0, 0, 0)
+
 
 class TestCoverageService:
     """Tests for CoverageService"""
@@ -221,7 +221,44 @@ class TestCoverageService:
             assert 'tokens' in index[idx]
             assert 'words_in_list' in index[idx]
             assert 'in_list_ratio' in index[idx]
-    
+
+    def test_prenormalized_keys_skip_lemma_normalization(self, mocker):
+        """Keys flagged as already normalized are used as given"""
+        spy = mocker.spy(LinguisticsUtils, 'normalize_french_lemma')
+        parent = CoverageService({"L'homme", 'Chat'})
+        assert parent.wordlist_keys == {'lehomme', 'chat'}
+        calls = spy.call_count
+
+        child = CoverageService(set(parent.wordlist_keys), keys_normalized=True)
+
+        assert child.wordlist_keys == parent.wordlist_keys
+        assert spy.call_count == calls
+
+    def test_build_sentence_index_skips_long_sentences_before_nlp(self, mocker):
+        """Sentences that certainly exceed len_max never reach the NLP pipeline"""
+        from app.utils.linguistics import DummyNLP
+
+        seen = []
+
+        class RecordingNLP(DummyNLP):
+            def pipe(self, texts, **kwargs):
+                for text in texts:
+                    seen.append(text)
+                    yield self(text)
+
+        mocker.patch('app.utils.linguistics.get_nlp', return_value=RecordingNLP())
+        service = CoverageService({'le', 'chat'}, {'len_min': 1, 'len_max': 4})
+
+        sentences = [
+            "Le chat — dort",  # punctuation-only chunks do not count towards the length
+            "Le chat mange la souris dans la cuisine",
+        ]
+
+        index = service.build_sentence_index(sentences)
+
+        assert seen == [sentences[0]]
+        assert 1 not in index
+
     def test_coverage_mode_greedy(self):
         """Test coverage mode greedy algorithm"""
         wordlist_keys = {'le', 'chat', 'manger', 'dormir'}
@@ -251,7 +288,32 @@ class TestCoverageService:
             assert 'word_key' in assignment
             assert 'sentence_index' in assignment
             assert 'sentence_text' in assignment
-    
+
+    def test_coverage_mode_greedy_big_step(self):
+        """Test that big-step greedy selects several sentences per iteration"""
+        # Each word occurs in exactly one sentence: classic greedy needs 3 picks
+        wordlist_keys = {'chat', 'chien', 'maison'}
+        sentences = [
+            "Le chat mange.",
+            "Le chien dort.",
+            "La maison est grande.",
+        ]
+
+        service = CoverageService(wordlist_keys, {'greedy_big_step': 3})
+        assignments, stats = service.coverage_mode_greedy(sentences)
+
+        baseline = CoverageService(wordlist_keys, {})
+        _, baseline_stats = baseline.coverage_mode_greedy(sentences)
+
+        assert stats['words_covered'] == baseline_stats['words_covered'] == 3
+        assert stats['learning_set_count'] == baseline_stats['learning_set_count'] == 3
+        assert baseline_stats['productive_iterations'] == 3
+        assert stats['productive_iterations'] == 1
+
+        # Each word is assigned to exactly one sentence even when picks overlap
+        word_keys = [a['word_key'] for a in assignments]
+        assert len(word_keys) == len(set(word_keys))
+
     def test_filter_mode(self):
         """Test filter mode with multi-pass approach"""
         wordlist_keys = {'le', 'chat', 'manger', 'dormir', 'petit'}
@@ -331,10 +393,10 @@ class TestCoverageService:
 class TestCoverageModels:
     """Tests for coverage models"""
     
-    def test_wordlist_model(self, app, sample_user):
+    def test_wordlist_model(self, app, test_user):
         """Test WordList model"""
         wordlist = WordList(
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             name="Test List",
             source_type='manual',
             normalized_count=100,
@@ -350,10 +412,10 @@ class TestCoverageModels:
         assert data['normalized_count'] == 100
         assert len(data['canonical_samples']) == 3
     
-    def test_coverage_run_model(self, app, sample_user):
+    def test_coverage_run_model(self, app, test_user):
         """Test CoverageRun model"""
         run = CoverageRun(
-            user_id=sample_user.id,
+            user_id=test_user.id,
             mode='filter',
             source_type='history',
             source_id=1,
@@ -369,11 +431,11 @@ class TestCoverageModels:
         assert data['source_type'] == 'history'
         assert data['status'] == 'pending'
     
-    def test_coverage_assignment_model(self, app, sample_user):
+    def test_coverage_assignment_model(self, app, test_user):
         """Test CoverageAssignment model"""
         # Create a coverage run first
         run = CoverageRun(
-            user_id=sample_user.id,
+            user_id=test_user.id,
             mode='coverage',
             source_type='history',
             source_id=1
@@ -1,78 +1,47 @@
 """Integration tests for Vocabulary Coverage Tool metrics and end-to-end flows"""
+import orjson
 import pytest
-import json
-from app import create_app, db
+from sqlalchemy import insert
+from app import db
 from app.models import User, WordList, CoverageRun, CoverageAssignment, History, Job
 from app.services.wordlist_service import WordListService
 from app.services.coverage_service import CoverageService
-from flask_jwt_extended import create_access_token
 
 
-@pytest.fixture(scope='function')
-def app():
-    """Create application for testing"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
-
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
-
-
-@pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='test123',
-        is_active=True
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
+# The shared session-scoped app, client and test user from conftest; every test
+# runs inside a rolled-back transaction
+pytestmark = pytest.mark.usefixtures('db_session')
 
 
 @pytest.fixture
-def auth_headers(app, sample_user):
-    """Create authentication headers"""
-    access_token = create_access_token(identity=str(sample_user.id))
-    return {
-        'Authorization': f'Bearer {access_token}',
-        'Content-Type': 'application/json'
-    }
+def auth_headers(auth_headers):
+    """The session auth headers, for JSON request bodies"""
+    return {**auth_headers, 'Content-Type': 'application/json'}
 
 
 @pytest.fixture
-def sample_wordlist(app, sample_user):
+def sample_wordlist(app, test_user):
     """Create a sample word list"""
     service = WordListService()
     wordlist, _ = service.ingest_word_list(
         words=["le", "chat", "chien", "maison", "manger", "dormir"],
         name="Test Word List",
-        owner_user_id=sample_user.id,
+        owner_user_id=test_user.id,
         source_type='manual'
     )
-    db.session.commit()
+    db.session.flush()
     return wordlist
 
 
 @pytest.fixture
-def sample_history(app, sample_user):
-    """Create a sample history entry with sentences"""
-    history = History(
-        user_id=sample_user.id,
+def sample_history(app, test_user):
+    """Create a sample history entry with sentences
+
+    Inserted with a Core INSERT rather than through the unit of work, so the
+    fixture stays cheap when ``sentences`` grows to realistic PDF-extract sizes.
+    """
+    result = db.session.execute(insert(History).values(
+        user_id=test_user.id,
         original_filename='test.pdf',
         processed_sentences_count=3,
         sentences=[
@@ -80,10 +49,8 @@ def sample_history(app, sample_user):
             {'normalized': 'Le chien dort.', 'original': 'Le chien dort.'},
             {'normalized': 'La maison est grande.', 'original': 'La maison est grande.'}
         ]
-    )
-    db.session.add(history)
-    db.session.commit()
-    return history
+    ))
+    return db.session.get(History, result.inserted_primary_key[0])
 
 
 class TestMetricsEndpoint:
@@ -121,7 +88,7 @@ class TestWordListAPIs:
         response = client.get('/api/v1/wordlists', headers=auth_headers)
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert 'wordlists' in data
         assert 'pagination' in data
         assert len(data['wordlists']) >= 1
@@ -138,11 +105,11 @@ class TestWordListAPIs:
         response = client.post(
             '/api/v1/wordlists',
             headers=auth_headers,
-            data=json.dumps(payload)
+            data=orjson.dumps(payload)
         )
         
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert 'wordlist' in data
         assert 'ingestion_report' in data
         assert data['wordlist']['name'] == 'New List'
@@ -155,7 +122,7 @@ class TestWordListAPIs:
         )
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert data['id'] == sample_wordlist.id
         assert data['name'] == sample_wordlist.name
     
@@ -166,11 +133,11 @@ class TestWordListAPIs:
         response = client.patch(
             f'/api/v1/wordlists/{sample_wordlist.id}',
             headers=auth_headers,
-            data=json.dumps(payload)
+            data=orjson.dumps(payload)
         )
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert data['name'] == 'Updated Name'
     
     def test_delete_wordlist(self, client, auth_headers, sample_wordlist):
@@ -209,21 +176,21 @@ class TestCoverageRunAPIs:
         response = client.post(
             '/api/v1/coverage/run',
             headers=auth_headers,
-            data=json.dumps(payload)
+            data=orjson.dumps(payload)
         )
         
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert 'coverage_run' in data
         assert 'task_id' in data
         assert data['coverage_run']['mode'] == 'coverage'
         assert data['coverage_run']['status'] == 'pending'
     
-    def test_get_coverage_run(self, client, auth_headers, sample_user, sample_wordlist, sample_history):
+    def test_get_coverage_run(self, client, auth_headers, test_user, sample_wordlist, sample_history):
         """Test getting coverage run details"""
         # Create a coverage run
         coverage_run = CoverageRun(
-            user_id=sample_user.id,
+            user_id=test_user.id,
             mode='coverage',
             source_type='history',
             source_id=sample_history.id,
@@ -239,7 +206,7 @@ class TestCoverageRunAPIs:
         )
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert 'coverage_run' in data
         assert data['coverage_run']['id'] == coverage_run.id
 
@@ -305,7 +272,7 @@ class TestCoverageServiceIntegration:
 class TestIngestionReporting:
     """Tests for ingestion report generation"""
     
-    def test_ingestion_report_duplicates(self, app, sample_user):
+    def test_ingestion_report_duplicates(self, app, test_user):
         """Test that duplicates are reported correctly"""
         service = WordListService()
         
@@ -313,14 +280,14 @@ class TestIngestionReporting:
         wordlist, report = service.ingest_word_list(
             words=words,
             name="Duplicate Test",
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             source_type='manual'
         )
         
         assert report['original_count'] == 4
         assert len(report['duplicates']) > 0
     
-    def test_ingestion_report_variants(self, app, sample_user):
+    def test_ingestion_report_variants(self, app, test_user):
         """Test that variants are expanded correctly"""
         service = WordListService()
         
@@ -328,13 +295,13 @@ class TestIngestionReporting:
         wordlist, report = service.ingest_word_list(
             words=words,
             name="Variant Test",
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             source_type='manual'
         )
         
         assert report['variants_expanded'] > 0
     
-    def test_ingestion_report_multi_token(self, app, sample_user):
+    def test_ingestion_report_multi_token(self, app, test_user):
         """Test that multi-token entries are flagged"""
         service = WordListService()
         
@@ -342,7 +309,7 @@ class TestIngestionReporting:
         wordlist, report = service.ingest_word_list(
             words=words,
             name="Multi-token Test",
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             source_type='manual'
         )
         
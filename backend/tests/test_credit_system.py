@@ -3,6 +3,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 from flask import Flask
+from sqlalchemy import insert
 from app import db
 from app.models import User, CreditLedger, Job
 from app.services.credit_service import CreditService
@@ -17,55 +18,56 @@ from app.constants import (
     JOB_STATUS_FAILED,
     MONTHLY_CREDIT_GRANT
 )
-from config import Config
 
 
-class TestConfig(Config):
-    TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    RATELIMIT_ENABLED = False
+@pytest.fixture(scope='session')
+def current_month():
+    """The month for the whole run, so tests straddling a month boundary stay consistent"""
+    return CreditService.get_current_month()
 
 
-@pytest.fixture
-def app():
-    """Create Flask app for testing"""
-    from app import create_app
-    app = create_app(TestConfig)
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
+@pytest.fixture(autouse=True)
+def _freeze_current_month(monkeypatch, current_month):
+    """Make the services default to the same month the tests assert against"""
+    monkeypatch.setattr(CreditService, 'get_current_month', staticmethod(lambda: current_month))
+
 
+def _insert_job(user_id, **overrides):
+    """Insert a pending job row and return its id.
 
-@pytest.fixture
-def test_user(app):
-    """Create a test user"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='test_google_id'
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
+    The credit tests only need a job id to reserve against, so this skips the ORM
+    unit of work (instance state, identity map, flush events) for a single INSERT.
+    """
+    values = {
+        'user_id': user_id,
+        'original_filename': 'test.pdf',
+        'model': 'gemini-2.5-flash',
+        'estimated_tokens': 1000,
+        'estimated_credits': 10,
+        'pricing_version': 'v1.0',
+        'pricing_rate': 1.0,
+        'status': JOB_STATUS_PENDING,
+    }
+    values.update(overrides)
+    result = db.session.execute(insert(Job).values(**values))
+    return result.inserted_primary_key[0]
 
 
+@pytest.mark.usefixtures('db_session')
 class TestCreditService:
     """Tests for CreditService"""
     
-    def test_get_current_month(self, app):
-        """Test getting current month"""
-        month = CreditService.get_current_month()
+    def test_get_current_month(self, app, current_month):
+        """Test getting current month (computed once per session by the real method)"""
+        month = current_month
         assert len(month) == 7
         assert month[:4].isdigit()  # Year
         assert month[4] == '-'
         assert month[5:].isdigit()  # Month
     
-    def test_grant_monthly_credits(self, app, test_user):
+    def test_grant_monthly_credits(self, app, test_user, current_month):
         """Test granting monthly credits"""
-        month = CreditService.get_current_month()
+        month = current_month
         
         # Grant credits
         entry = CreditService.grant_monthly_credits(test_user.id, month)
@@ -90,9 +92,10 @@ class TestCreditService:
         created = CreditService.ensure_monthly_grant(test_user.id)
         assert created is False
     
-    def test_calculate_balance(self, app, test_user):
+    @pytest.mark.max_queries(9)
+    def test_calculate_balance(self, app, test_user, current_month):
         """Test calculating balance"""
-        month = CreditService.get_current_month()
+        month = current_month
         
         # Initially 0
         balance = CreditService.calculate_balance(test_user.id, month)
@@ -104,116 +107,77 @@ class TestCreditService:
         assert balance == MONTHLY_CREDIT_GRANT
         
         # Reserve some credits (simulate job)
-        job = Job(
-            user_id=test_user.id,
-            original_filename='test.pdf',
-            model='gemini-2.5-flash',
-            estimated_tokens=1000,
-            estimated_credits=10,
-            pricing_version='v1.0',
-            pricing_rate=1.0,
-            status=JOB_STATUS_PENDING
-        )
-        db.session.add(job)
-        db.session.commit()
+        job_id = _insert_job(test_user.id)
         
-        success, _ = CreditService.reserve_credits(test_user.id, job.id, 10)
+        success, _ = CreditService.reserve_credits(test_user.id, job_id, 10)
         assert success is True
         
         balance = CreditService.calculate_balance(test_user.id, month)
         assert balance == MONTHLY_CREDIT_GRANT - 10
     
-    def test_reserve_credits_insufficient(self, app, test_user):
+    def test_reserve_credits_insufficient(self, app, test_user, current_month):
         """Test reserving credits with insufficient balance"""
-        month = CreditService.get_current_month()
+        month = current_month
         
         # Create a job
-        job = Job(
-            user_id=test_user.id,
-            original_filename='test.pdf',
-            model='gemini-2.5-flash',
-            estimated_tokens=100000,
-            estimated_credits=100000,
-            pricing_version='v1.0',
-            pricing_rate=1.0,
-            status=JOB_STATUS_PENDING
-        )
-        db.session.add(job)
-        db.session.commit()
+        job_id = _insert_job(test_user.id, estimated_tokens=100000, estimated_credits=100000)
         
         # Grant only 100 credits
         CreditService.grant_monthly_credits(test_user.id, month, amount=100)
         
         # Try to reserve 100000 credits
-        success, error = CreditService.reserve_credits(test_user.id, job.id, 100000)
+        success, error = CreditService.reserve_credits(test_user.id, job_id, 100000)
         assert success is False
         assert 'Insufficient credits' in error
     
-    def test_adjust_final_credits(self, app, test_user):
+    @pytest.mark.max_queries(9)
+    def test_adjust_final_credits(self, app, test_user, current_month):
         """Test adjusting credits after job completion"""
-        month = CreditService.get_current_month()
+        month = current_month
         CreditService.grant_monthly_credits(test_user.id, month)
         
         # Create and reserve for a job
-        job = Job(
-            user_id=test_user.id,
-            original_filename='test.pdf',
-            model='gemini-2.5-flash',
-            estimated_tokens=1000,
-            estimated_credits=10,
-            pricing_version='v1.0',
-            pricing_rate=1.0,
-            status=JOB_STATUS_PENDING
-        )
-        db.session.add(job)
-        db.session.commit()
+        job_id = _insert_job(test_user.id)
         
-        CreditService.reserve_credits(test_user.id, job.id, 10)
+        CreditService.reserve_credits(test_user.id, job_id, 10)
         
         # Adjust final (used only 5)
-        entry = CreditService.adjust_final_credits(test_user.id, job.id, 10, 5)
+        entry = CreditService.adjust_final_credits(test_user.id, job_id, 10, 5)
         assert entry is not None
         assert entry.delta_credits == 5  # Refund 5 credits
         
         # Balance should be back to original - 5
-        balance = CreditService.calculate_balance(test_user.id, month)
-        assert balance == MONTHLY_CREDIT_GRANT - 5
+        summary = CreditService.get_credit_summary(test_user.id, month)
+        assert summary['balance'] == MONTHLY_CREDIT_GRANT - 5
+        assert summary['used'] == 10
+        assert summary['refunded'] == 5
     
-    def test_refund_credits(self, app, test_user):
+    @pytest.mark.max_queries(9)
+    def test_refund_credits(self, app, test_user, current_month):
         """Test refunding credits for failed job"""
-        month = CreditService.get_current_month()
+        month = current_month
         CreditService.grant_monthly_credits(test_user.id, month)
         
         # Create and reserve for a job
-        job = Job(
-            user_id=test_user.id,
-            original_filename='test.pdf',
-            model='gemini-2.5-flash',
-            estimated_tokens=1000,
-            estimated_credits=10,
-            pricing_version='v1.0',
-            pricing_rate=1.0,
-            status=JOB_STATUS_PENDING
-        )
-        db.session.add(job)
-        db.session.commit()
+        job_id = _insert_job(test_user.id)
         
-        CreditService.reserve_credits(test_user.id, job.id, 10)
-        balance_after_reserve = CreditService.calculate_balance(test_user.id, month)
+        CreditService.reserve_credits(test_user.id, job_id, 10)
         
         # Refund all credits
-        entry = CreditService.refund_credits(test_user.id, job.id, 10, 'Job failed')
+        entry = CreditService.refund_credits(test_user.id, job_id, 10, 'Job failed')
         assert entry is not None
         assert entry.delta_credits == 10
         assert entry.reason == CREDIT_REASON_JOB_REFUND
         
         # Balance should be back to original
-        balance = CreditService.calculate_balance(test_user.id, month)
-        assert balance == MONTHLY_CREDIT_GRANT
+        summary = CreditService.get_credit_summary(test_user.id, month)
+        assert summary['balance'] == MONTHLY_CREDIT_GRANT
+        assert summary['used'] == 10
+        assert summary['refunded'] == 10
     
-    def test_admin_adjustment(self, app, test_user):
+    def test_admin_adjustment(self, app, test_user, current_month):
         """Test admin credit adjustment"""
-        month = CreditService.get_current_month()
+        month = current_month
         
         # Add admin adjustment
         entry = CreditService.admin_adjustment(
@@ -230,9 +194,10 @@ class TestCreditService:
         balance = CreditService.calculate_balance(test_user.id, month)
         assert balance == 5000
     
-    def test_get_credit_summary(self, app, test_user):
+    @pytest.mark.max_queries(4)
+    def test_get_credit_summary(self, app, test_user, current_month):
         """Test getting credit summary"""
-        month = CreditService.get_current_month()
+        month = current_month
         
         # Grant credits
         CreditService.grant_monthly_credits(test_user.id, month)
@@ -246,23 +211,46 @@ class TestCreditService:
         assert summary['month'] == month
         assert 'next_reset' in summary
 
+    def test_get_credit_summary_aggregates_ledger(self, app, test_user, current_month):
+        """Test summary totals across reserve, overrun and admin entries"""
+        month = current_month
+        CreditService.grant_monthly_credits(test_user.id, month)
+        
+        job_id = _insert_job(test_user.id)
+        
+        CreditService.reserve_credits(test_user.id, job_id, 10)
+        CreditService.adjust_final_credits(test_user.id, job_id, 10, 15)  # Overrun of 5
+        CreditService.admin_adjustment(test_user.id, amount=100, description='Bonus', month=month)
+        
+        summary = CreditService.get_credit_summary(test_user.id, month)
+        
+        assert summary['granted'] == MONTHLY_CREDIT_GRANT
+        assert summary['used'] == 15
+        assert summary['refunded'] == 0
+        assert summary['adjusted'] == 100
+        assert summary['balance'] == CreditService.calculate_balance(test_user.id, month)
 
-class TestJobService:
-    """Tests for JobService"""
+
+class TestJobServicePure:
+    """Tests for JobService helpers that need neither an app context nor the database"""
     
-    def test_get_model_name(self, app):
+    def test_get_model_name(self):
         """Test model name mapping"""
         assert JobService.get_model_name('balanced') == 'gemini-2.5-flash'
         assert JobService.get_model_name('quality') == 'gemini-2.5-pro'
         assert JobService.get_model_name('speed') == 'gemini-2.5-flash-lite'
     
-    def test_get_pricing_rate(self, app):
+    def test_get_pricing_rate(self):
         """Test getting pricing rate"""
-        assert JobService.get_pricing_rate('gemini-2.5-flash') == 1
+        assert JobService.get_pricing_rate('gemini-2.5-flash') == 3
         assert JobService.get_pricing_rate('gemini-2.5-pro') == 5
-        assert JobService.get_pricing_rate('gemini-2.5-flash-lite') == 1
+        assert JobService.get_pricing_rate('gemini-2.5-flash-lite') == 2
+
+    def test_get_pricing_rate_unknown_model(self):
+        """Test that unknown models are billed at the balanced (flash) rate"""
+        assert JobService.get_pricing_rate('unknown-model') == 3
     
-    def test_estimate_tokens_heuristic(self, app):
+    def test_estimate_tokens_heuristic(self):
         """Test heuristic token estimation"""
         text = 'a' * 400  # 400 characters
         tokens = JobService.estimate_tokens_heuristic(text)
@@ -271,20 +259,46 @@ class TestJobService:
         assert tokens >= 100
         assert tokens <= 150
     
-    def test_calculate_credits(self, app):
+    def test_calculate_credits(self):
         """Test credit calculation"""
-        # 1000 tokens with rate 1 = 1 credit
+        # 1000 tokens with rate 2 = 2 credits
         credits = JobService.calculate_credits(1000, 'gemini-2.5-flash-lite')
-        assert credits == 1
+        assert credits == 2
         
         # 1000 tokens with rate 5 = 5 credits
         credits = JobService.calculate_credits(1000, 'gemini-2.5-pro')
         assert credits == 5
         
-        # 500 tokens with rate 1 = 1 credit (rounded up)
-        credits = JobService.calculate_credits(500, 'gemini-2.5-flash')
+        # 1500 tokens with rate 3 = 4.5, rounded up to 5 credits
+        credits = JobService.calculate_credits(1500, 'gemini-2.5-flash')
+        assert credits == 5
+        
+        # 1 token still costs at least one credit
+        credits = JobService.calculate_credits(1, 'gemini-2.5-flash')
         assert credits == 1
     
+    def test_estimate_job_cost(self):
+        """Test estimating job cost"""
+        text = 'a' * 4000  # Should be ~1000 tokens with heuristic
+        
+        estimate = JobService.estimate_job_cost(text, 'balanced', prefer_api=False)
+        
+        assert 'model' in estimate
+        assert estimate['model'] == 'gemini-2.5-flash'
+        assert estimate['model_preference'] == 'balanced'
+        assert 'estimated_tokens' in estimate
+        assert 'estimated_credits' in estimate
+        # 4000 chars / 4 = 1000 tokens + 10% buffer = 1100; 1.1K tokens at rate 3 = 4 credits
+        assert estimate['estimated_tokens'] == 1100
+        assert estimate['estimated_credits'] == 4
+        assert estimate['pricing_rate'] == 3
+        assert estimate['estimation_method'] == 'heuristic'
+
+
+@pytest.mark.usefixtures('db_session')
+class TestJobService:
+    """Tests for JobService lifecycle methods backed by the database"""
+    
     def test_create_job(self, app, test_user):
         """Test creating a job"""
         job = JobService.create_job(
@@ -316,8 +330,7 @@ class TestJobService:
         success = JobService.start_job(job.id)
         assert success is True
         
-        # Refresh job
-        job = Job.query.get(job.id)
+        # start_job updated this same identity-mapped instance
         assert job.status == 'processing'
         assert job.started_at is not None
     
@@ -355,17 +368,3 @@ class TestJobService:
         assert failed_job.error_message == 'Test error'
         assert failed_job.error_code == 'TEST_ERROR'
         assert failed_job.completed_at is not None
-    
-    def test_estimate_job_cost(self, app):
-        """Test estimating job cost"""
-        text = 'a' * 4000  # Should be ~1000 tokens with heuristic
-        
-        estimate = JobService.estimate_job_cost(text, 'balanced', prefer_api=False)
-        
-        assert 'model' in estimate
-        assert estimate['model'] == 'gemini-2.5-flash'
-        assert estimate['model_preference'] == 'balanced'
-        assert 'estimated_tokens' in estimate
-        assert 'estimated_credits' in estimate
-        assert estimate['pricing_rate'] == 1
-        assert estimate['estimation_method'] == 'heuristic'
@@ -1,65 +1,45 @@
 """Tests for timezone-aware datetime handling in OAuth token expiry"""
 import pytest
 from datetime import datetime, timedelta, timezone
-from app import create_app, db
-from app.models import User
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+from app import db
 from app.services.auth_service import AuthService
-from config import Config
 
 
-class TestConfig(Config):
-    """Test configuration that works with SQLite"""
-    TESTING = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    GOOGLE_CLIENT_ID = 'test_client_id'
-    GOOGLE_CLIENT_SECRET = 'test_client_secret'
-    # Override engine options for SQLite compatibility
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True
-    }
+pytestmark = pytest.mark.usefixtures('db_session')
 
 
-@pytest.fixture(scope='function')
-def app():
-    """Create application for testing"""
-    app = create_app(config_class=TestConfig)
+@pytest.fixture(autouse=True)
+def offline_token_refresh(monkeypatch):
+    """Fail OAuth token refreshes locally instead of calling Google's token endpoint.
 
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
+    The test tokens are fake, so a real refresh could only ever fail - after a
+    network round trip (or a DNS timeout on offline hosts).
+    """
+    def refresh(self, request):
+        raise RefreshError('Token refresh disabled in tests')
 
-
-@pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='test123',
-        is_active=True,
-        google_access_token='test_access_token',
-        google_refresh_token='test_refresh_token'
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
+    monkeypatch.setattr(Credentials, 'refresh', refresh)
 
 
 class TestDatetimeHandling:
     """Tests for timezone-aware datetime handling"""
     
-    def test_naive_datetime_expiry_is_normalized(self, app, sample_user):
+    def test_naive_datetime_expiry_is_normalized(self, app, test_user):
         """Test that naive datetime expiry values are normalized to timezone-aware UTC"""
         # Set a naive datetime expiry (no timezone info)
         naive_expiry = datetime.utcnow() + timedelta(hours=1)
         assert naive_expiry.tzinfo is None, "Test setup: expiry should be naive"
         
-        sample_user.google_token_expiry = naive_expiry
+        test_user.google_token_expiry = naive_expiry
         db.session.commit()
         
+        # The column hands the value back as aware UTC, with the same wall time
+        db.session.refresh(test_user)
+        assert test_user.google_token_expiry.tzinfo is timezone.utc
+        assert test_user.google_token_expiry.replace(tzinfo=None) == naive_expiry
+        
         # AuthService should handle this without raising TypeError
         auth_service = AuthService()
         
@@ -67,7 +47,7 @@ class TestDatetimeHandling:
         try:
             # get_user_credentials internally compares expiry with datetime.now(timezone.utc)
             # If the stored expiry is naive, it should be normalized before comparison
-            credentials = auth_service.get_user_credentials(sample_user)
+            credentials = auth_service.get_user_credentials(test_user)
             # If we get here without exception, the normalization worked
             assert True
         except TypeError as e:
@@ -76,32 +56,36 @@ class TestDatetimeHandling:
             else:
                 raise
     
-    def test_aware_datetime_expiry_works(self, app, sample_user):
+    def test_aware_datetime_expiry_works(self, app, test_user):
         """Test that timezone-aware datetime expiry values work correctly"""
         # Set an aware datetime expiry (with timezone info)
         aware_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
         assert aware_expiry.tzinfo is not None, "Test setup: expiry should be timezone-aware"
         
-        sample_user.google_token_expiry = aware_expiry
+        test_user.google_token_expiry = aware_expiry
         db.session.commit()
         
+        db.session.refresh(test_user)
+        assert test_user.google_token_expiry == aware_expiry
+        assert test_user.google_token_expiry.tzinfo is timezone.utc
+        
         # AuthService should handle this normally
         auth_service = AuthService()
         
         # This should work without any issues
         try:
-            credentials = auth_service.get_user_credentials(sample_user)
+            credentials = auth_service.get_user_credentials(test_user)
             assert credentials is not None
         except TypeError as e:
             pytest.fail(f"Datetime comparison failed with aware datetime: {e}")
     
-    def test_expired_naive_token_comparison(self, app, sample_user):
+    def test_expired_naive_token_comparison(self, app, test_user):
         """Test comparison when token is expired and stored as naive datetime"""
         # Set an expired naive datetime (1 hour ago)
         expired_naive = datetime.utcnow() - timedelta(hours=1)
         assert expired_naive.tzinfo is None, "Test setup: expiry should be naive"
         
-        sample_user.google_token_expiry = expired_naive
+        test_user.google_token_expiry = expired_naive
         db.session.commit()
         
         # AuthService should detect expiry without raising TypeError
@@ -111,7 +95,7 @@ class TestDatetimeHandling:
             # This should detect the token is expired and attempt refresh
             # Since we don't have valid refresh credentials, it will fail at refresh
             # But it should NOT fail at the datetime comparison stage
-            credentials = auth_service.get_user_credentials(sample_user)
+            credentials = auth_service.get_user_credentials(test_user)
             # We may get here or may raise ValueError from refresh attempt
         except ValueError as e:
             # Expected: refresh will fail with our test tokens
@@ -198,3 +182,24 @@ class TestDatetimeHandling:
                     pytest.fail(f"ISO string expiry not properly handled during comparison: {e}")
                 else:
                     raise
+    
+    def test_non_utc_expiry_is_stored_as_utc(self, app, test_user):
+        """Test that aware expiry values in other zones round-trip as the same instant in UTC"""
+        paris_summer = timezone(timedelta(hours=2))
+        expiry = datetime(2030, 6, 1, 14, 0, tzinfo=paris_summer)
+        
+        test_user.google_token_expiry = expiry
+        db.session.commit()
+        db.session.refresh(test_user)
+        
+        assert test_user.google_token_expiry == expiry
+        assert test_user.google_token_expiry == datetime(2030, 6, 1, 12, 0, tzinfo=timezone.utc)
+        assert test_user.google_token_expiry.tzinfo is timezone.utc
+    
+    def test_assigned_naive_expiry_is_aware_before_flush(self, app, test_user):
+        """Test that naive expiry values are made aware on assignment, not only on reload"""
+        naive_expiry = datetime(2030, 1, 1, 8, 30)
+        
+        test_user.google_token_expiry = naive_expiry
+        
+        assert test_user.google_token_expiry == naive_expiry.replace(tzinfo=timezone.utc)
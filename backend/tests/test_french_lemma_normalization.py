@@ -1,9 +1,15 @@
 """Unit tests for French lemma normalization feature (Issue #1, Phase 1)"""
 import pytest
-from app.utils.linguistics import LinguisticsUtils
+from app.utils.linguistics import ELISION_EXPANSIONS, LinguisticsUtils
 from app.services.wordlist_service import WordListService
 
 
+@pytest.fixture(scope="module")
+def service():
+    """One WordListService for the module; it holds no per-instance state"""
+    return WordListService()
+
+
 class TestFrenchLemmaNormalization:
     """Tests for French-specific lemma normalization helper function"""
     
@@ -25,34 +31,42 @@ class TestFrenchLemmaNormalization:
         assert LinguisticsUtils.normalize_french_lemma("qu'il") == "queil"
         assert LinguisticsUtils.normalize_french_lemma("qu'elle") == "queelle"
     
-    def test_elision_expansions_all(self):
+    @pytest.mark.parametrize("input_word,expected", [
+        ("l'eau", "leeau"),
+        ("d'ici", "deici"),
+        ("j'adore", "jeadore"),
+        ("qu'un", "queun"),
+        ("n'est", "neest"),
+        ("t'aime", "teaime"),
+        ("c'est", "ceest"),
+        ("m'aider", "meaider"),
+    ])
+    def test_elision_expansions_all(self, input_word, expected):
         """Test all supported elision patterns"""
-        expansions = {
-            "l'eau": "leeau",
-            "d'ici": "deici",
-            "j'adore": "jeadore",
-            "qu'un": "queun",
-            "n'est": "neest",
-            "t'aime": "teaime",
-            "c'est": "ceest",
-            "m'aider": "meaider",
-        }
-        
-        for input_word, expected in expansions.items():
-            result = LinguisticsUtils.normalize_french_lemma(input_word)
-            assert result == expected, f"Expected {input_word} → {expected}, got {result}"
+        assert LinguisticsUtils.normalize_french_lemma(input_word) == expected
+
+    @pytest.mark.parametrize("contraction,full", sorted(ELISION_EXPANSIONS.items()))
+    def test_every_table_entry_expands(self, contraction, full):
+        """Test that each entry of the production table is applied"""
+        assert LinguisticsUtils.normalize_french_lemma(f"{contraction}'ami") == f"{full}ami"
     
-    def test_reflexive_pronoun_se_underscore(self):
+    # spaCy often lemmatizes reflexive verbs with se_ prefix
+    @pytest.mark.parametrize("lemma,expected", [
+        ("se_laver", "laver"),
+        ("se_lever", "lever"),
+        ("se_appeler", "appeler"),
+    ])
+    def test_reflexive_pronoun_se_underscore(self, lemma, expected):
         """Test that reflexive pronouns with se_ prefix are handled"""
-        # spaCy often lemmatizes reflexive verbs with se_ prefix
-        assert LinguisticsUtils.normalize_french_lemma("se_laver") == "laver"
-        assert LinguisticsUtils.normalize_french_lemma("se_lever") == "lever"
-        assert LinguisticsUtils.normalize_french_lemma("se_appeler") == "appeler"
+        assert LinguisticsUtils.normalize_french_lemma(lemma) == expected
     
-    def test_reflexive_pronoun_s_apostrophe(self):
+    @pytest.mark.parametrize("lemma,expected", [
+        ("s'appeler", "appeler"),
+        ("s'habiller", "habiller"),
+    ])
+    def test_reflexive_pronoun_s_apostrophe(self, lemma, expected):
         """Test that reflexive pronouns with s' prefix are handled"""
-        assert LinguisticsUtils.normalize_french_lemma("s'appeler") == "appeler"
-        assert LinguisticsUtils.normalize_french_lemma("s'habiller") == "habiller"
+        assert LinguisticsUtils.normalize_french_lemma(lemma) == expected
     
     def test_case_normalization(self):
         """Test that case is normalized to lowercase"""
@@ -92,10 +106,8 @@ class TestFrenchLemmaNormalization:
 class TestWordListNormalizationAlignment:
     """Tests to ensure word list normalization works correctly with lemma matching"""
     
-    def test_wordlist_extracts_head_from_elisions(self):
+    def test_wordlist_extracts_head_from_elisions(self, service):
         """Test that word list normalization extracts head words from elisions"""
-        service = WordListService()
-        
         # Elisions should extract the lexical head (for matching against lemmatized text)
         assert service.normalize_word("l'homme") == "homme"
         assert service.normalize_word("d'abord") == "abord"
@@ -108,10 +120,8 @@ class TestWordListNormalizationAlignment:
         assert LinguisticsUtils.normalize_french_lemma("se_appeler") == "appeler"
         assert LinguisticsUtils.normalize_french_lemma("s'appeler") == "appeler"
     
-    def test_wordlist_and_lemma_matching_scenario(self):
+    def test_wordlist_and_lemma_matching_scenario(self, service):
         """Test that word lists and lemmas match correctly in realistic scenarios"""
-        service = WordListService()
-        
         # Scenario 1: Word list has base form, sentence has reflexive verb
         # Word list: "laver"  →  "laver"
         # Lemma: "se_laver"  →  "laver" (after normalize_french_lemma + normalize_text)
@@ -132,10 +142,8 @@ class TestWordListNormalizationAlignment:
         )
         assert wordlist_normalized == lemma_normalized == "homme"
     
-    def test_diacritics_folding_consistency(self):
+    def test_diacritics_folding_consistency(self, service):
         """Test that diacritic folding works consistently in both paths"""
-        service = WordListService()
-        
         # With diacritics folding
         assert service.normalize_word("café", fold_diacritics=True) == "cafe"
         assert service.normalize_word("élève", fold_diacritics=True) == "eleve"
@@ -174,22 +182,29 @@ class TestNormalizationIntegration:
         # Step 2: Apply general text normalization
         step2 = LinguisticsUtils.normalize_text(step1, fold_diacritics=True)
         assert step2 == "lehomme"
-    
-    def test_common_french_words_normalization(self):
+
+    @pytest.mark.parametrize("lemma", [
+        "l'homme", "Se_Laver", "s'Élever", "  qu'Éric  ", "aujourd'hui",
+        "chat​chien", "Œuvre", "café", "", "   ",
+    ])
+    @pytest.mark.parametrize("fold", [True, False])
+    def test_fused_pipeline_matches_two_steps(self, lemma, fold):
+        """Test that normalize_lemma_full equals normalize_french_lemma then normalize_text"""
+        expected = LinguisticsUtils.normalize_text(
+            LinguisticsUtils.normalize_french_lemma(lemma), fold_diacritics=fold
+        )
+        assert LinguisticsUtils.normalize_lemma_full(lemma, fold_diacritics=fold) == expected
+
+    @pytest.mark.parametrize("word,expected", [
+        ("être", "etre"),
+        ("avoir", "avoir"),
+        ("l'être", "etre"),  # Extract head word
+        ("d'avoir", "avoir"),  # Extract head word
+        ("aujourd'hui", "aujourdhui"),
+    ])
+    def test_common_french_words_normalization(self, service, word, expected):
         """Test normalization of common French words that might appear in word lists"""
-        service = WordListService()
-        
-        common_words = {
-            "être": "etre",
-            "avoir": "avoir",
-            "l'être": "etre",  # Extract head word
-            "d'avoir": "avoir",  # Extract head word
-            "aujourd'hui": "aujourdhui",
-        }
-        
-        for word, expected in common_words.items():
-            result = service.normalize_word(word, fold_diacritics=True)
-            assert result == expected, f"Expected {word} → {expected}, got {result}"
+        assert service.normalize_word(word, fold_diacritics=True) == expected
 
 
 class TestEdgeCases:
@@ -208,55 +223,54 @@ class TestEdgeCases:
         assert LinguisticsUtils.normalize_french_lemma("maison") == "maison"
         assert LinguisticsUtils.normalize_french_lemma("bonjour") == "bonjour"
     
-    def test_numeric_and_special_chars_in_wordlist(self):
+    def test_numeric_and_special_chars_in_wordlist(self, service):
         """Test that word list normalization handles special characters"""
-        service = WordListService()
-        
         # Numbers and punctuation should be removed from word list entries
         assert service.normalize_word("1. avoir") == "avoir"
         assert service.normalize_word("2) être") == "etre"
         assert service.normalize_word("3: chat") == "chat"
     
-    def test_quoted_words_in_wordlist(self):
+    def test_quoted_words_in_wordlist(self, service):
         """Test that quotes are removed from word list entries"""
-        service = WordListService()
-        
         assert service.normalize_word('"chat"') == "chat"
         assert service.normalize_word("'chien'") == "chien"
         assert service.normalize_word('"l\'homme"') == "lehomme"
     
-    def test_zero_width_characters(self):
+    def test_zero_width_characters(self, service):
         """Test that zero-width characters are removed"""
-        service = WordListService()
-        
         # Zero-width space (U+200B)
         word_with_zwsp = "chat\u200bchien"
         assert service.normalize_word(word_with_zwsp) == "chatchien"
 
+    def test_repeated_inputs_are_memoized(self, service):
+        """Test that repeats are served from the cache, keyed on the folding flag too"""
+        assert service.normalize_word("Été") == "ete"
+        assert service.normalize_word("Été") == "ete"
+        assert service.normalize_word("Été", fold_diacritics=False) == "été"
+        assert WordListService.normalize_word.cache_info().hits == 1
+
+        assert LinguisticsUtils.normalize_french_lemma("l'homme") == "lehomme"
+        assert LinguisticsUtils.normalize_french_lemma("l'homme") == "lehomme"
+        assert LinguisticsUtils.normalize_french_lemma.cache_info().hits == 1
+
 
 class TestBackwardsCompatibility:
     """Tests to ensure the changes don't break existing functionality"""
     
-    def test_basic_normalization_still_works(self):
+    def test_basic_normalization_still_works(self, service):
         """Test that basic normalization (case, whitespace) still works"""
-        service = WordListService()
-        
         assert service.normalize_word("CHAT") == "chat"
         assert service.normalize_word("  Chien  ") == "chien"
         assert service.normalize_word("Maison") == "maison"
     
-    def test_variant_splitting_still_works(self):
+    def test_variant_splitting_still_works(self, service):
         """Test that variant splitting is not affected"""
-        service = WordListService()
-        
         assert service.split_variants("chat|chats") == ["chat", "chats"]
         assert service.split_variants("bon/bonne") == ["bon", "bonne"]
         assert service.split_variants("un,une") == ["un", "une"]
     
-    def test_head_token_extraction_still_works(self):
+    def test_head_token_extraction_still_works(self, service):
         """Test that multi-token head extraction is not affected"""
-        service = WordListService()
-        
         assert service.extract_head_token("le chat") == "chat"
         assert service.extract_head_token("un chien") == "chien"
         assert service.extract_head_token("la maison") == "maison"
@@ -6,48 +6,23 @@ to ensure proper handling of global wordlists with versioning and automatic seed
 """
 import pytest
 from pathlib import Path
-from app import create_app, db
-from app.models import User, WordList
+from app import db
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from app.models import WordList
 from app.services.global_wordlist_manager import GlobalWordlistManager
 from tempfile import NamedTemporaryFile
 
 
-@pytest.fixture(scope='function')
-def app():
-    """Create application for testing"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
-
-
-@pytest.fixture
-def sample_user(app):
-    """Create a sample user for testing"""
-    user = User(
-        email='test@example.com',
-        name='Test User',
-        google_id='12345'
-    )
-    db.session.add(user)
-    db.session.commit()
-    return user
+# The shared in-memory app from conftest (its TestConfig is built before the engine,
+# unlike a URI patched in after create_app); each test is rolled back at teardown
+pytestmark = pytest.mark.usefixtures('db_session')
 
 
 class TestGlobalWordlistManager:
     """Tests for GlobalWordlistManager class"""
     
+    @pytest.mark.max_queries(2)
     def test_create_from_file(self, app):
         """Test creating a global wordlist from a file"""
         # Create a temporary wordlist file
@@ -133,6 +108,18 @@ class TestGlobalWordlistManager:
         assert default.id == wordlist.id
         assert default.is_global_default is True
     
+    def test_default_serializes_without_loading_words(self, app):
+        """Test that to_dict on the default never pulls the deferred word list"""
+        db.session.add(WordList(owner_user_id=None, name="Test Global Default",
+                                source_type='manual', normalized_count=2,
+                                words_json=['word1', 'word2'], is_global_default=True))
+        db.session.commit()
+        db.session.expunge_all()
+
+        default = GlobalWordlistManager.get_global_default()
+        assert default.to_dict()['normalized_count'] == 2
+        assert 'words_json' in inspect(default).unloaded
+    
     def test_set_global_default(self, app):
         """Test setting a wordlist as global default"""
         # Create two global wordlists
@@ -165,11 +152,22 @@ class TestGlobalWordlistManager:
         db.session.refresh(wordlist1)
         assert wordlist1.is_global_default is False
     
-    def test_set_global_default_user_wordlist_fails(self, app, sample_user):
+    def test_second_global_default_is_rejected(self, app):
+        """Test that the database allows only one global default"""
+        db.session.add_all([
+            WordList(owner_user_id=None, name=f"Default {i}", source_type='manual',
+                     normalized_count=1, words_json=['word'], is_global_default=True)
+            for i in range(2)
+        ])
+
+        with pytest.raises(IntegrityError):
+            db.session.flush()
+
+    def test_set_global_default_user_wordlist_fails(self, app, test_user):
         """Test that setting a user wordlist as global default fails"""
         # Create a user wordlist
         wordlist = WordList(
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             name="User Wordlist",
             source_type='manual',
             normalized_count=10,
@@ -183,7 +181,7 @@ class TestGlobalWordlistManager:
         with pytest.raises(ValueError, match="Only global wordlists"):
             GlobalWordlistManager.set_global_default(wordlist.id)
     
-    def test_list_global_wordlists(self, app, sample_user):
+    def test_list_global_wordlists(self, app, test_user):
         """Test listing all global wordlists"""
         # Create global and user wordlists
         global_wl1 = WordList(
@@ -203,7 +201,7 @@ class TestGlobalWordlistManager:
             is_global_default=False
         )
         user_wl = WordList(
-            owner_user_id=sample_user.id,
+            owner_user_id=test_user.id,
             name="User Wordlist",
             source_type='manual',
             normalized_count=10,
@@ -221,6 +219,7 @@ class TestGlobalWordlistManager:
         # Default should be first
         assert global_wordlists[0].is_global_default is True
     
+    @pytest.mark.max_queries(2)
     def test_get_stats(self, app):
         """Test getting statistics about global wordlists"""
         # Create a global default
@@ -249,10 +248,8 @@ class TestGlobalWordlistManager:
 class TestGlobalWordlistAPIs:
     """Tests for global wordlist API endpoints"""
     
-    def test_get_global_wordlist_stats(self, client, app, sample_user):
+    def test_get_global_wordlist_stats(self, client, auth_headers):
         """Test GET /api/v1/wordlists/global/stats"""
-        from flask_jwt_extended import create_access_token
-        
         # Create a global default
         wordlist = WordList(
             owner_user_id=None,
@@ -265,12 +262,8 @@ class TestGlobalWordlistAPIs:
         db.session.add(wordlist)
         db.session.commit()
         
-        # Get JWT token
-        access_token = create_access_token(identity=str(sample_user.id))
-        headers = {'Authorization': f'Bearer {access_token}'}
-        
         # Call API
-        response = client.get('/api/v1/wordlists/global/stats', headers=headers)
+        response = client.get('/api/v1/wordlists/global/stats', headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json
@@ -278,10 +271,8 @@ class TestGlobalWordlistAPIs:
         assert data['total_global_wordlists'] == 1
         assert data['default_wordlist']['normalized_count'] == 50
     
-    def test_get_global_default_wordlist(self, client, app, sample_user):
+    def test_get_global_default_wordlist(self, client, auth_headers):
         """Test GET /api/v1/wordlists/global/default"""
-        from flask_jwt_extended import create_access_token
-        
         # Create a global default
         wordlist = WordList(
             owner_user_id=None,
@@ -294,12 +285,8 @@ class TestGlobalWordlistAPIs:
         db.session.add(wordlist)
         db.session.commit()
         
-        # Get JWT token
-        access_token = create_access_token(identity=str(sample_user.id))
-        headers = {'Authorization': f'Bearer {access_token}'}
-        
         # Call API
-        response = client.get('/api/v1/wordlists/global/default', headers=headers)
+        response = client.get('/api/v1/wordlists/global/default', headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json
@@ -307,23 +294,15 @@ class TestGlobalWordlistAPIs:
         assert data['is_global_default'] is True
         assert data['normalized_count'] == 50
     
-    def test_get_global_default_wordlist_not_found(self, client, app, sample_user):
+    def test_get_global_default_wordlist_not_found(self, client, auth_headers):
         """Test GET /api/v1/wordlists/global/default when none exists"""
-        from flask_jwt_extended import create_access_token
-        
-        # Get JWT token
-        access_token = create_access_token(identity=str(sample_user.id))
-        headers = {'Authorization': f'Bearer {access_token}'}
-        
         # Call API
-        response = client.get('/api/v1/wordlists/global/default', headers=headers)
+        response = client.get('/api/v1/wordlists/global/default', headers=auth_headers)
         
         assert response.status_code == 404
     
-    def test_list_global_wordlists_api(self, client, app, sample_user):
+    def test_list_global_wordlists_api(self, client, auth_headers):
         """Test GET /api/v1/wordlists/global"""
-        from flask_jwt_extended import create_access_token
-        
         # Create global wordlists
         global_wl1 = WordList(
             owner_user_id=None,
@@ -344,12 +323,8 @@ class TestGlobalWordlistAPIs:
         db.session.add_all([global_wl1, global_wl2])
         db.session.commit()
         
-        # Get JWT token
-        access_token = create_access_token(identity=str(sample_user.id))
-        headers = {'Authorization': f'Bearer {access_token}'}
-        
         # Call API
-        response = client.get('/api/v1/wordlists/global', headers=headers)
+        response = client.get('/api/v1/wordlists/global', headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json
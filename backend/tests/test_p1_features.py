@@ -1,28 +1,12 @@
 """Tests for P1 backend features."""
 import pytest
-import os
-import sys
 import json
 from unittest.mock import MagicMock, patch
-from flask import Flask
-
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.services.gemini_service import GeminiService
 from app.services.google_sheets_service import GoogleSheetsService
 from app.schemas import ExportToSheetSchema, UserSettingsSchema, ProcessPdfOptionsSchema
 from marshmallow import ValidationError
-from config import Config
-
-
-@pytest.fixture
-def app_context():
-    """Create Flask app context for testing"""
-    app = Flask(__name__)
-    app.config.from_object(Config)
-    with app.app_context():
-        yield app
 
 
 class TestGeminiServiceP1Features:
@@ -222,7 +206,6 @@ class TestExportToSheetSchema:
         assert result['folderId'] is None
 
 
-
 class TestUserSettingsSchema:
     """Test user settings schema with P1 features"""
     
@@ -425,6 +408,5 @@ class TestGoogleSheetsServiceP1Features:
         assert url == 'https://docs.google.com/spreadsheets/d/test123'
 
 
-
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -2,12 +2,6 @@
 Test suite for Phase 1 Prompt Improvements
 Tests the improved Gemini prompt for French novel sentence rewriting.
 """
-import sys
-import os
-
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 import pytest
 from unittest.mock import MagicMock, patch
 from flask import Flask
@@ -1,14 +1,10 @@
 import pytest
 import os
-import sys
 from unittest.mock import MagicMock, patch
 from werkzeug.datastructures import FileStorage
 from io import BytesIO
 from flask import Flask
 
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from app.services.pdf_service import PDFService
 from app.services.gemini_service import GeminiService
 from app.services.user_settings_service import UserSettingsService
@@ -118,6 +114,84 @@ def test_pdf_service_get_page_count_corrupted_pdf():
         pdf_service.get_page_count(file_stream=stream)
 
 
+class _FakeFitzPage:
+    def __init__(self, image_count):
+        self.image_count = image_count
+
+    def get_images(self, full=False):
+        assert full is False
+        return [(xref,) for xref in range(self.image_count)]
+
+
+class _FakeFitzDoc:
+    def __init__(self, images_per_page):
+        self.page_count = len(images_per_page)
+        self.pages = [_FakeFitzPage(count) for count in images_per_page]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self.pages)
+
+
+def test_pdf_service_get_page_count_pymupdf_fast_path(monkeypatch, tmp_path):
+    """Test that the PyMuPDF path opens file-backed uploads by path and counts images"""
+    from types import SimpleNamespace
+    from app.services import pdf_service as pdf_service_module
+
+    pdf_path = tmp_path / 'upload.pdf'
+    pdf_path.write_bytes(b'%PDF-1.4 fake')
+    opened = []
+
+    def fake_open(path, filetype):
+        opened.append((path, filetype))
+        return _FakeFitzDoc(images_per_page=[2, 0, 1])
+
+    monkeypatch.setattr(pdf_service_module, 'fitz', SimpleNamespace(open=fake_open))
+
+    with open(pdf_path, 'rb') as stream:
+        metadata = PDFService(None).get_page_count(file_stream=stream)
+
+    assert metadata == {'page_count': 3, 'file_size': 13, 'image_count': 3}
+    assert opened == [(str(pdf_path), 'pdf')]
+
+
+def test_pdf_service_get_page_count_pymupdf_skips_in_memory_streams(monkeypatch):
+    """Test that in-memory streams are never copied into PyMuPDF"""
+    from types import SimpleNamespace
+    from app.services import pdf_service as pdf_service_module
+
+    def fake_open(*args, **kwargs):
+        raise AssertionError('in-memory streams must go through PdfReader')
+
+    monkeypatch.setattr(pdf_service_module, 'fitz', SimpleNamespace(open=fake_open))
+
+    with pytest.raises(RuntimeError, match='Failed to read PDF metadata'):
+        PDFService(None).get_page_count(file_stream=BytesIO(b'Not a valid PDF file'))
+
+
+def test_pdf_service_get_page_count_pymupdf_corrupted_pdf(monkeypatch, tmp_path):
+    """Test that PyMuPDF open errors surface as RuntimeError"""
+    from types import SimpleNamespace
+    from app.services import pdf_service as pdf_service_module
+
+    pdf_path = tmp_path / 'broken.pdf'
+    pdf_path.write_bytes(b'Not a valid PDF file')
+
+    def fake_open(path, filetype):
+        raise ValueError('cannot open broken document')
+
+    monkeypatch.setattr(pdf_service_module, 'fitz', SimpleNamespace(open=fake_open))
+
+    with open(pdf_path, 'rb') as stream:
+        with pytest.raises(RuntimeError, match='Failed to read PDF metadata'):
+            PDFService(None).get_page_count(file_stream=stream)
+
+
 @patch('app.services.gemini_service.genai.Client')
 def test_gemini_service_prompt_includes_phase1_sections(mock_client, app_context):
     """Ensure the Gemini prompt contains the advanced literary guidance."""
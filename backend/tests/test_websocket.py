@@ -1,14 +1,9 @@
 """Tests for WebSocket real-time job progress updates"""
 import pytest
-import os
-import sys
 from unittest.mock import MagicMock, patch
 from flask import Flask
 from flask_socketio import SocketIOTestClient
 
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from app import create_app, socketio
 from app.models import Job, User
 from config import Config